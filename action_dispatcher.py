@@ -0,0 +1,223 @@
+"""
+Action Dispatcher Module
+Runs blink actions (key presses, callbacks, sockets, files) off the detection loop
+
+pyautogui.press() blocks for at least pyautogui.PAUSE (0.1 s), which stalls
+the frame loop on every blink when called inline. The detection loop instead
+hands events to ActionDispatcher.dispatch(), which only puts them on a bounded
+queue and never blocks. A worker thread delivers each event to the configured
+sinks.
+
+Events are plain dicts, e.g. {'type': 'blink', 'time': 1712.5, 'count': 3}.
+"""
+
+import json
+import queue
+import socket
+import threading
+import time
+
+
+class KeypressSink:
+    def __init__(self, key='enter'):
+        """
+        Press a key for every event
+
+        Args:
+            key (str): pyautogui key name
+        """
+        self.key = key
+        self.pyautogui = None
+
+    def open(self):
+        """Import and configure pyautogui (slow; runs in the dispatcher thread)"""
+        import pyautogui
+        pyautogui.FAILSAFE = True  # Move mouse to top-left corner to abort
+        pyautogui.PAUSE = 0.1      # Small pause between actions
+        self.pyautogui = pyautogui
+
+    def send(self, event):
+        self.pyautogui.press(self.key)
+        print(f"[ACTION] {self.key.capitalize()} key pressed (blink #{event.get('count')})")
+
+    def close(self):
+        pass
+
+
+class CallbackSink:
+    def __init__(self, callback):
+        """
+        Call a function for every event
+
+        Args:
+            callback (callable): Called with the event dict (in the dispatcher thread)
+        """
+        self.callback = callback
+
+    def open(self):
+        pass
+
+    def send(self, event):
+        self.callback(event)
+
+    def close(self):
+        pass
+
+
+class SocketSink:
+    def __init__(self, address):
+        """
+        Send every event as a JSON datagram to a local socket
+
+        Datagrams never wait for a receiver, so a missing listener costs nothing.
+
+        Args:
+            address: (host, port) for UDP, or a path for a Unix datagram socket
+        """
+        self.address = address
+        self.sock = None
+
+    def open(self):
+        family = socket.AF_UNIX if isinstance(self.address, str) else socket.AF_INET
+        self.sock = socket.socket(family, socket.SOCK_DGRAM)
+
+    def send(self, event):
+        try:
+            self.sock.sendto(json.dumps(event).encode('utf-8'), self.address)
+        except (ConnectionRefusedError, FileNotFoundError):
+            # Nobody listening right now
+            pass
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+class FileSink:
+    def __init__(self, path):
+        """
+        Append every event as a JSON line to a file
+
+        Args:
+            path (str): Output file
+        """
+        self.path = path
+        self.file = None
+
+    def open(self):
+        self.file = open(self.path, 'a')
+
+    def send(self, event):
+        self.file.write(json.dumps(event) + '\n')
+        self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class ActionDispatcher:
+    def __init__(self, sinks, debounce=0.2, queue_size=32):
+        """
+        Initialize the action dispatcher
+
+        Args:
+            sinks (list): Sink objects with open(), send(event) and close()
+            debounce (float): Minimum seconds between dispatched events; events
+                arriving sooner are dropped (0 disables debouncing)
+            queue_size (int): Maximum queued events; when full, new events are
+                dropped rather than blocking the caller
+        """
+        self.sinks = list(sinks)
+        self.debounce = debounce
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = None
+        self.last_dispatch = None
+
+        # Statistics
+        self.dispatched = 0
+        self.debounced = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def start(self):
+        """Start the worker thread (sinks are opened there, off the caller's thread)"""
+        self.thread = threading.Thread(target=self._run, name="action-dispatcher", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        """Deliver the queued events, then stop the worker and close the sinks"""
+        if self.thread is None:
+            return
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self.thread.join(timeout)
+        self.thread = None
+
+    def dispatch(self, event):
+        """
+        Queue an event for the sinks; never blocks
+
+        Args:
+            event (dict): Event to deliver
+
+        Returns:
+            bool: True if queued, False if debounced or the queue was full
+        """
+        now = time.monotonic()
+        if self.last_dispatch is not None and now - self.last_dispatch < self.debounce:
+            self.debounced += 1
+            return False
+
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+        self.last_dispatch = now
+        self.dispatched += 1
+        return True
+
+    def _run(self):
+        """Open the sinks, then deliver events until stopped"""
+        for sink in list(self.sinks):
+            try:
+                sink.open()
+            except Exception as e:
+                print(f"[ERROR] Failed to open {type(sink).__name__}: {e}")
+                self.sinks.remove(sink)
+
+        while True:
+            event = self.queue.get()
+            if event is None:
+                break
+            for sink in self.sinks:
+                try:
+                    sink.send(event)
+                except Exception as e:
+                    self.errors += 1
+                    print(f"[ERROR] {type(sink).__name__} failed: {e}")
+
+        for sink in self.sinks:
+            sink.close()
+
+    def get_stats(self):
+        """
+        Get dispatcher statistics
+
+        Returns:
+            dict: Dispatched, debounced, dropped and failed event counts
+        """
+        return {
+            'dispatched': self.dispatched,
+            'debounced': self.debounced,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'queued': self.queue.qsize()
+        }
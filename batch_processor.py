@@ -0,0 +1,214 @@
+"""
+Batch Processor Module
+Headless offline blink detection over recorded video files
+
+Runs the same EyeTracker pipeline as main.py, but without any display,
+drawing or key polling, so footage is processed as fast as it can be decoded.
+
+Usage:
+    python batch_processor.py recording.mp4 --output results.csv
+    python batch_processor.py a.mp4 b.mp4 --output results.jsonl
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+
+import cv2
+
+from blink_state import BlinkStateMachine
+from eye_tracker import EyeTracker
+from frame_buffers import FrameBuffers
+
+
+RECORD_FIELDS = ['video', 'frame', 'timestamp_ms', 'faces', 'eyes', 'blink', 'total_blinks']
+
+
+class RecordWriter:
+    """Write per-frame records as CSV or JSON Lines, chosen by file extension"""
+
+    def __init__(self, path):
+        """
+        Initialize the record writer
+
+        Args:
+            path (str): Output file path (.csv or .jsonl)
+        """
+        self.path = path
+        self.format = 'jsonl' if path.lower().endswith(('.jsonl', '.json')) else 'csv'
+        self.file = open(path, 'w', newline='')
+        self.csv_writer = None
+
+        if self.format == 'csv':
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=RECORD_FIELDS)
+            self.csv_writer.writeheader()
+
+    def write(self, record):
+        """Write a single per-frame record"""
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(record)
+        else:
+            self.file.write(json.dumps(record) + '\n')
+
+    def close(self):
+        """Flush and close the output file"""
+        self.file.close()
+
+
+def process_video(path, eye_tracker, width=600):
+    """
+    Run face/eye and blink detection over every frame of a video file
+
+    Args:
+        path: Path to the video file, or a camera index
+        eye_tracker (EyeTracker): Tracker instance (its counters and face
+            tracking state are reset first)
+        width (int): Processing width, matching CameraManager's resize
+
+    Yields:
+        dict: Per-frame record with eye count and blink flag
+    """
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise IOError(f"Cannot open video source: {path}")
+
+    name = os.path.basename(path) if isinstance(path, str) else f"camera{path}"
+    eye_tracker.reset_counters()
+    eye_tracker.reset_tracking()
+    frame_index = 0
+
+    # Decoded and resized frames reuse the same buffers every iteration
+    buffers = FrameBuffers()
+    raw = None
+
+    try:
+        while True:
+            grabbed, raw = capture.read(raw)
+            if not grabbed:
+                break
+
+            timestamp_ms = capture.get(cv2.CAP_PROP_POS_MSEC)
+            frame = buffers.resize(raw, width)
+
+            # Files carry their own timeline; live cameras use the wall clock
+            timestamp = timestamp_ms / 1000.0 if isinstance(path, str) else None
+
+            faces, eyes, _ = eye_tracker.detect_faces_and_eyes(frame, draw=False)
+            blink_detected = eye_tracker.process_blink_detection(eyes, timestamp)
+
+            yield {
+                'video': name,
+                'frame': frame_index,
+                'timestamp_ms': round(timestamp_ms, 3),
+                'faces': len(faces),
+                'eyes': len(eyes),
+                'blink': int(blink_detected),
+                'total_blinks': eye_tracker.total_blinks
+            }
+            frame_index += 1
+    finally:
+        capture.release()
+
+
+def run_batch(video_paths, output_path, width=600, consecutive_frames=3,
+              face_tracking=False, detection_interval=10, eye_search='full',
+              detection_scale=1.0, blink_engine=False):
+    """
+    Process a list of video files and write all records to one output file
+
+    Args:
+        video_paths (list): Video files to process
+        output_path (str): Output .csv or .jsonl file
+        width (int): Processing width
+        consecutive_frames (int): Frames needed to confirm a blink
+        face_tracking (bool): Use EyeTracker's face tracking mode
+        detection_interval (int): Frames between full face detections when tracking
+        eye_search (str): EyeTracker eye search mode ('full' or 'upper')
+        detection_scale (float): Face detection scale relative to the processing width
+        blink_engine (bool): Confirm blinks with the time-based BlinkStateMachine
+            instead of consecutive frame counting
+
+    Returns:
+        list: Per-video summaries (frames, blinks, elapsed seconds, fps)
+    """
+    eye_tracker = EyeTracker(consecutive_frames=consecutive_frames,
+                             face_tracking=face_tracking,
+                             detection_interval=detection_interval,
+                             eye_search=eye_search,
+                             detection_scale=detection_scale,
+                             blink_engine=BlinkStateMachine.for_eye_count() if blink_engine else None)
+    writer = RecordWriter(output_path)
+    summaries = []
+
+    try:
+        for path in video_paths:
+            print(f"[INFO] Processing {path}...")
+            frames = 0
+            start = time.perf_counter()
+
+            for record in process_video(path, eye_tracker, width=width):
+                writer.write(record)
+                frames += 1
+
+            elapsed = time.perf_counter() - start
+            fps = frames / elapsed if elapsed > 0 else 0.0
+            summaries.append({
+                'video': path,
+                'frames': frames,
+                'blinks': eye_tracker.total_blinks,
+                'elapsed_s': round(elapsed, 3),
+                'fps': round(fps, 1)
+            })
+            print(f"[INFO] {path}: {frames} frames, {eye_tracker.total_blinks} blinks, "
+                  f"{elapsed:.1f}s ({fps:.1f} fps)")
+    finally:
+        writer.close()
+
+    return summaries
+
+
+def main():
+    """Command-line entry point"""
+    ap = argparse.ArgumentParser(description="Headless blink detection over recorded videos")
+    ap.add_argument("videos", nargs="+", help="video files to process")
+    ap.add_argument("-o", "--output", default="blink_results.csv",
+                    help="output file (.csv or .jsonl)")
+    ap.add_argument("-w", "--width", type=int, default=600,
+                    help="processing frame width")
+    ap.add_argument("-c", "--consecutive-frames", type=int, default=3,
+                    help="frames needed to confirm a blink")
+    ap.add_argument("-t", "--track-faces", action="store_true",
+                    help="search around the previous face instead of the full frame")
+    ap.add_argument("-i", "--detection-interval", type=int, default=10,
+                    help="frames between full face detections when tracking")
+    ap.add_argument("-e", "--eye-search", choices=['full', 'upper'], default='full',
+                    help="search the whole face or only its upper band for eyes")
+    ap.add_argument("-s", "--detection-scale", type=float, default=1.0,
+                    help="face detection scale relative to --width (e.g. 0.5)")
+    ap.add_argument("-b", "--blink-engine", action="store_true",
+                    help="confirm blinks by duration in ms instead of consecutive frames")
+    args = ap.parse_args()
+
+    summaries = run_batch(args.videos, args.output, width=args.width,
+                          consecutive_frames=args.consecutive_frames,
+                          face_tracking=args.track_faces,
+                          detection_interval=args.detection_interval,
+                          eye_search=args.eye_search,
+                          detection_scale=args.detection_scale,
+                          blink_engine=args.blink_engine)
+
+    total_frames = sum(s['frames'] for s in summaries)
+    total_elapsed = sum(s['elapsed_s'] for s in summaries)
+    overall_fps = total_frames / total_elapsed if total_elapsed > 0 else 0.0
+    print(f"\n[INFO] Batch Summary:")
+    print(f"  Videos processed: {len(summaries)}")
+    print(f"  Total frames: {total_frames}")
+    print(f"  Total blinks: {sum(s['blinks'] for s in summaries)}")
+    print(f"  Throughput: {overall_fps:.1f} fps")
+    print(f"  Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""
+Detector Benchmark Suite
+Runs every blink detection pipeline headless over the same clips and compares
+throughput, per-frame latency, peak memory and blink count agreement
+
+Pipelines:
+    eye_tracker  - EyeTracker (Haar face + Haar eyes, eye-count heuristic)
+    eye_tracker_landmark - EyeTracker with the dlib landmark EAR backend
+    opencv_ratio - BlinkDetector from blink_detection_opencv.py
+    dlib_hog     - dlib HOG face detector + 68 landmarks (detect_blinks_mine.py)
+    haar_dlib    - Haar face detector + dlib 68 landmarks (detect_blinks_opencv.py)
+
+Each pipeline runs in its own process so peak RSS is measured in isolation.
+Results are written as JSON; pass a previous result file with --baseline to
+see throughput changes between versions.
+
+Usage:
+    python benchmarks/bench_detectors.py clip1.mp4 clip2.mp4 -o bench.json
+    python benchmarks/bench_detectors.py --synthetic 300 --baseline bench.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import cv2
+import imutils
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from ear import LEFT_EYE_IDXS, RIGHT_EYE_IDXS, eye_aspect_ratio
+from latency import LatencyProfiler
+import model_manager
+
+
+SHAPE_PREDICTOR_PATH = os.path.join(ROOT_DIR, "shape_predictor_68_face_landmarks.dat")
+
+# Blink events from two pipelines match if they are at most this many frames apart
+MATCH_TOLERANCE_FRAMES = 5
+
+
+class EyeTrackerVariant:
+    width = 600
+    backend = 'haar'
+
+    def __init__(self):
+        from eye_tracker import EyeTracker
+        self.tracker = EyeTracker(backend=self.backend).preload()
+
+    def process(self, frame):
+        _, eyes, _ = self.tracker.detect_faces_and_eyes(frame, draw=False)
+        return self.tracker.process_blink_detection(eyes)
+
+
+class EyeTrackerLandmarkVariant(EyeTrackerVariant):
+    backend = 'landmark'
+
+    def __init__(self):
+        from eye_backends import LandmarkEARBackend
+        self.backend = LandmarkEARBackend(SHAPE_PREDICTOR_PATH)
+        super().__init__()
+
+
+class OpenCVRatioVariant:
+    width = 600
+
+    def __init__(self):
+        from blink_detection_opencv import BlinkDetector
+        self.detector = BlinkDetector()
+
+    def process(self, frame):
+        total = self.detector.total_blinks
+        self.detector.detect_blink(frame)
+        return self.detector.total_blinks > total
+
+
+class EARCounter:
+    """Consecutive low-EAR frame counter of the original dlib scripts, for one face"""
+
+    def __init__(self, ear_threshold, consecutive_frames):
+        self.ear_threshold = ear_threshold
+        self.consecutive_frames = consecutive_frames
+        self.counter = 0
+        self.total_blinks = 0
+
+    def update(self, ear, timestamp=None):
+        """Returns True when a blink ends on this frame, otherwise None"""
+        if ear < self.ear_threshold:
+            self.counter += 1
+            return None
+        blink = self.counter >= self.consecutive_frames
+        self.counter = 0
+        if blink:
+            self.total_blinks += 1
+            return True
+        return None
+
+
+class LandmarkVariant:
+    """Shared EAR logic of the two dlib scripts (threshold 0.25, 3 frames per face)"""
+
+    width = 450
+    ear_threshold = 0.25
+    consecutive_frames = 3
+
+    def __init__(self, rect_detector):
+        """
+        Args:
+            rect_detector (callable): Maps a grayscale frame to dlib face rectangles
+        """
+        from face_tracks import MultiFaceTracker
+        self.rect_detector = rect_detector
+        self.predictor = model_manager.get_shape_predictor(SHAPE_PREDICTOR_PATH)
+
+        # Each face keeps its own counter, as in the scripts
+        self.tracks = MultiFaceTracker(
+            engine_factory=lambda: EARCounter(self.ear_threshold, self.consecutive_frames))
+
+    def process(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        boxes, ears = [], []
+
+        for rect in self.rect_detector(gray):
+            shape = self.predictor(gray, rect)
+            shape = np.array([(p.x, p.y) for p in shape.parts()])
+            ears.append((eye_aspect_ratio(shape[LEFT_EYE_IDXS[0]:LEFT_EYE_IDXS[1]]) +
+                         eye_aspect_ratio(shape[RIGHT_EYE_IDXS[0]:RIGHT_EYE_IDXS[1]])) / 2.0)
+            boxes.append((rect.left(), rect.top(), rect.width(), rect.height()))
+
+        return bool(self.tracks.update(boxes, face_ears=ears))
+
+
+class DlibHOGVariant(LandmarkVariant):
+    def __init__(self):
+        import dlib
+        detector = dlib.get_frontal_face_detector()
+        super().__init__(lambda gray: detector(gray, 0))
+
+
+class HaarDlibVariant(LandmarkVariant):
+    def __init__(self):
+        import dlib
+        face_cascade = model_manager.get_cascade(model_manager.FACE_CASCADE)
+
+        def detect_rects(gray):
+            faces = face_cascade.detectMultiScale(gray, 1.1, 4)
+            return [dlib.rectangle(int(x), int(y), int(x + w), int(y + h))
+                    for (x, y, w, h) in faces]
+
+        super().__init__(detect_rects)
+
+
+VARIANTS = {
+    'eye_tracker': EyeTrackerVariant,
+    'eye_tracker_landmark': EyeTrackerLandmarkVariant,
+    'opencv_ratio': OpenCVRatioVariant,
+    'dlib_hog': DlibHOGVariant,
+    'haar_dlib': HaarDlibVariant
+}
+
+
+def synthetic_frames(count, width=640, height=480, seed=0):
+    """Deterministic noise frames with a face-like blob (throughput only - no real faces)"""
+    rng = np.random.default_rng(seed)
+    for i in range(count):
+        frame = rng.integers(0, 255, size=(height, width, 3), dtype=np.uint8)
+        center = (width // 2 + int(20 * np.sin(i / 10.0)), height // 2)
+        cv2.ellipse(frame, center, (90, 120), 0, 0, 360, (160, 180, 200), -1)
+        yield frame
+
+
+def clip_frames(clip):
+    """Decode a recorded clip frame by frame"""
+    capture = cv2.VideoCapture(clip)
+    if not capture.isOpened():
+        raise IOError(f"Cannot open video file: {clip}")
+    try:
+        while True:
+            grabbed, frame = capture.read()
+            if not grabbed:
+                return
+            yield frame
+    finally:
+        capture.release()
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return round(peak / (1024.0 * 1024.0 if sys.platform == 'darwin' else 1024.0), 1)
+
+
+def run_variant(name, clips, synthetic):
+    """
+    Run one pipeline over all clips (executed in a child process)
+
+    Returns:
+        dict: Per-clip throughput, latency percentiles and blink frame indices
+    """
+    variant = VARIANTS[name]()
+    results = {}
+
+    sources = [(clip, lambda c=clip: clip_frames(c)) for clip in clips]
+    if synthetic:
+        sources.append((f"synthetic:{synthetic}", lambda: synthetic_frames(synthetic)))
+
+    for clip_name, frames in sources:
+        profiler = LatencyProfiler(window=None)
+        blink_frames = []
+        processing_time = 0.0
+        count = 0
+
+        for index, frame in enumerate(frames()):
+            frame = imutils.resize(frame, width=variant.width)
+
+            start = time.perf_counter()
+            blink = variant.process(frame)
+            duration = time.perf_counter() - start
+
+            profiler.add('frame', duration)
+            processing_time += duration
+            count += 1
+            if blink:
+                blink_frames.append(index)
+
+        latency = profiler.get_stats().get('frame', {})
+        results[clip_name] = {
+            'frames': count,
+            'fps': round(count / processing_time, 1) if processing_time > 0 else 0.0,
+            'latency_ms': {k: round(v, 3) for k, v in latency.items()},
+            'blinks': len(blink_frames),
+            'blink_frames': blink_frames
+        }
+
+    return {'results': results, 'peak_rss_mb': peak_rss_mb()}
+
+
+def _child(name, clips, synthetic, conn):
+    try:
+        conn.send(run_variant(name, clips, synthetic))
+    except Exception as e:
+        conn.send({'error': f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def run_isolated(name, clips, synthetic):
+    """Run a pipeline in a fresh process so its peak RSS is not shared"""
+    parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_child, args=(name, clips, synthetic, child_conn))
+    process.start()
+
+    # Guard against children that die without reporting (e.g. a crash in native code)
+    while not parent_conn.poll(0.5):
+        if not process.is_alive() and not parent_conn.poll():
+            return {'error': f"process exited with code {process.exitcode}"}
+
+    result = parent_conn.recv()
+    process.join()
+    return result
+
+
+def match_events(reference, candidate, tolerance=MATCH_TOLERANCE_FRAMES):
+    """
+    Greedily match blink frame indices between two pipelines
+
+    Returns:
+        float: F1 agreement score (1.0 = identical events)
+    """
+    if not reference and not candidate:
+        return 1.0
+
+    matched = 0
+    j = 0
+    for frame in reference:
+        while j < len(candidate) and candidate[j] < frame - tolerance:
+            j += 1
+        if j < len(candidate) and abs(candidate[j] - frame) <= tolerance:
+            matched += 1
+            j += 1
+
+    return round(2.0 * matched / (len(reference) + len(candidate)), 3)
+
+
+def git_revision():
+    """Current git commit, so results can be tied to a version"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def add_agreement(report, reference):
+    """Blink agreement of every pipeline against the reference pipeline, per clip"""
+    ref = report['variants'].get(reference, {}).get('results')
+    if not ref:
+        return
+
+    for variant in report['variants'].values():
+        for clip, result in variant.get('results', {}).items():
+            if clip in ref:
+                result['agreement_vs_' + reference] = match_events(
+                    ref[clip]['blink_frames'], result['blink_frames'])
+
+
+def print_report(report, baseline=None):
+    """Print a summary table, with fps change versus a baseline report"""
+    print(f"\n{'pipeline':<22}{'clip':<24}{'fps':>8}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'blinks':>8}{'agree':>7}{'RSS MB':>8}{'vs base':>9}")
+
+    for name, variant in report['variants'].items():
+        if 'error' in variant:
+            print(f"{name:<22}{'-':<24}  skipped: {variant['error']}")
+            continue
+
+        for clip, r in variant['results'].items():
+            agreement = r.get('agreement_vs_' + report['reference'], '')
+            delta = ''
+            if baseline:
+                base = baseline.get('variants', {}).get(name, {}).get('results', {}).get(clip)
+                if base and base['fps']:
+                    delta = f"{(r['fps'] - base['fps']) / base['fps'] * 100:+.1f}%"
+            print(f"{name:<22}{os.path.basename(clip)[:23]:<24}{r['fps']:>8}"
+                  f"{r['latency_ms'].get('p50', 0):>9.2f}{r['latency_ms'].get('p95', 0):>9.2f}"
+                  f"{r['blinks']:>8}{agreement:>7}{str(variant['peak_rss_mb']):>8}{delta:>9}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark all blink detection pipelines")
+    ap.add_argument("clips", nargs="*", help="recorded video clips")
+    ap.add_argument("-s", "--synthetic", type=int, default=0,
+                    help="also run N synthetic frames (throughput only)")
+    ap.add_argument("-p", "--pipelines", nargs="+", choices=list(VARIANTS), default=list(VARIANTS),
+                    help="pipelines to run")
+    ap.add_argument("-r", "--reference", default="eye_tracker",
+                    help="pipeline used as reference for blink agreement")
+    ap.add_argument("-o", "--output", default="bench_results.json", help="JSON result file")
+    ap.add_argument("-b", "--baseline", default=None, help="previous JSON result to compare against")
+    args = ap.parse_args()
+
+    if not args.clips and not args.synthetic:
+        ap.error("give at least one clip or --synthetic N")
+
+    report = {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'opencv': cv2.__version__,
+        'platform': platform.platform(),
+        'reference': args.reference,
+        'variants': {}
+    }
+
+    for name in args.pipelines:
+        print(f"[INFO] Running {name}...")
+        report['variants'][name] = run_isolated(name, args.clips, args.synthetic)
+
+    add_agreement(report, args.reference)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print_report(report, baseline)
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[INFO] Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
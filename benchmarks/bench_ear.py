@@ -0,0 +1,76 @@
+"""
+EAR Micro-benchmark
+Compares the per-eye scipy EAR used by the original dlib scripts with the
+vectorized batch EAR in ear.py
+
+Usage:
+    python benchmarks/bench_ear.py
+    python benchmarks/bench_ear.py --sizes 1 100 10000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+from scipy.spatial import distance as dist
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ear import LEFT_EYE_IDXS, RIGHT_EYE_IDXS, eye_aspect_ratios
+
+
+def scipy_eye_aspect_ratio(eye):
+    """Original per-eye EAR from detect_blinks.py"""
+    A = dist.euclidean(eye[1], eye[5])
+    B = dist.euclidean(eye[2], eye[4])
+    C = dist.euclidean(eye[0], eye[3])
+    return (A + B) / (2.0 * C)
+
+
+def scipy_batch(landmarks):
+    """Loop over faces the way the scripts do, one scipy EAR per eye"""
+    means = []
+    for shape in landmarks:
+        left = scipy_eye_aspect_ratio(shape[LEFT_EYE_IDXS[0]:LEFT_EYE_IDXS[1]])
+        right = scipy_eye_aspect_ratio(shape[RIGHT_EYE_IDXS[0]:RIGHT_EYE_IDXS[1]])
+        means.append((left + right) / 2.0)
+    return np.array(means)
+
+
+def random_landmarks(n, seed=0):
+    """Random integer landmarks, like face_utils.shape_to_np output"""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 450, size=(n, 68, 2)).astype(np.int64)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark scipy vs vectorized EAR")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000],
+                    help="batch sizes (faces or frames) to benchmark")
+    ap.add_argument("--repeat", type=int, default=5, help="timing repeats (best is reported)")
+    args = ap.parse_args()
+
+    print(f"{'N':>8} {'scipy (ms)':>12} {'vectorized (ms)':>16} {'speedup':>9}")
+
+    for n in args.sizes:
+        landmarks = random_landmarks(n)
+
+        # Both implementations must agree before timing them
+        _, _, vectorized = eye_aspect_ratios(landmarks)
+        if not np.allclose(vectorized, scipy_batch(landmarks)):
+            raise AssertionError(f"EAR mismatch for N={n}")
+
+        number = max(1, 10000 // n)
+        scipy_time = min(timeit.repeat(lambda: scipy_batch(landmarks),
+                                       number=number, repeat=args.repeat)) / number
+        vector_time = min(timeit.repeat(lambda: eye_aspect_ratios(landmarks),
+                                        number=number, repeat=args.repeat)) / number
+
+        print(f"{n:>8} {scipy_time * 1000:>12.4f} {vector_time * 1000:>16.4f} "
+              f"{scipy_time / vector_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
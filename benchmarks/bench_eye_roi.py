@@ -0,0 +1,87 @@
+"""
+Eye Search Benchmark
+Compares EyeTracker's full-face eye search with the upper-band search
+
+Faces are detected once per frame; eye detection is then timed for both modes
+on the same face regions. Besides time per face, the eye count distribution
+shows how often each mode finds more than two "eyes" (false positives).
+
+Usage:
+    python benchmarks/bench_eye_roi.py clip.mp4
+    python benchmarks/bench_eye_roi.py clip.mp4 --max-frames 500 --width 600
+"""
+
+import argparse
+import collections
+import os
+import sys
+import time
+
+import cv2
+import imutils
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eye_tracker import EyeTracker
+
+
+MODES = ['full', 'upper']
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark full vs upper-band eye search")
+    ap.add_argument("clip", help="recorded video clip with a visible face")
+    ap.add_argument("-w", "--width", type=int, default=600, help="processing frame width")
+    ap.add_argument("-n", "--max-frames", type=int, default=0, help="stop after N frames (0 = all)")
+    args = ap.parse_args()
+
+    trackers = {mode: EyeTracker(eye_search=mode) for mode in MODES}
+    eye_times = {mode: 0.0 for mode in MODES}
+    eye_counts = {mode: collections.Counter() for mode in MODES}
+    faces_seen = 0
+    frames = 0
+
+    capture = cv2.VideoCapture(args.clip)
+    if not capture.isOpened():
+        raise IOError(f"Cannot open video file: {args.clip}")
+
+    try:
+        while not args.max_frames or frames < args.max_frames:
+            grabbed, frame = capture.read()
+            if not grabbed:
+                break
+            frames += 1
+
+            frame = imutils.resize(frame, width=args.width)
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            faces = trackers['full'].detect_faces(gray)
+
+            for (x, y, w, h) in faces:
+                roi_gray = gray[y:y + h, x:x + w]
+                faces_seen += 1
+
+                for mode in MODES:
+                    start = time.perf_counter()
+                    eyes = trackers[mode].detect_eyes(roi_gray)
+                    eye_times[mode] += time.perf_counter() - start
+                    eye_counts[mode][min(len(eyes), 3)] += 1
+    finally:
+        capture.release()
+
+    if not faces_seen:
+        print("[WARNING] No faces detected in the clip")
+        return
+
+    print(f"[INFO] {frames} frames, {faces_seen} faces\n")
+    print(f"{'mode':<8}{'ms/face':>10}{'0 eyes':>9}{'1 eye':>8}{'2 eyes':>9}{'3+ eyes':>9}")
+    for mode in MODES:
+        counts = eye_counts[mode]
+        print(f"{mode:<8}{eye_times[mode] / faces_seen * 1000:>10.3f}"
+              f"{counts[0]:>9}{counts[1]:>8}{counts[2]:>9}{counts[3]:>9}")
+
+    if eye_times['upper'] > 0:
+        print(f"\n[INFO] Upper-band search speedup: {eye_times['full'] / eye_times['upper']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
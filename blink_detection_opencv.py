@@ -1,13 +1,14 @@
 import cv2
 import numpy as np
-import pyautogui
 import time
 from imutils.video import VideoStream
 import imutils
 
+from action_dispatcher import ActionDispatcher, KeypressSink
+
 
 class BlinkDetector:
-    def __init__(self):
+    def __init__(self, dispatcher=None):
         # Initialize face and eye cascade classifiers
         self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
         self.eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml')
@@ -20,9 +21,8 @@ class BlinkDetector:
         self.last_eye_area = 0
         self.eye_closed_frames = 0
         
-        # Configure pyautogui
-        pyautogui.FAILSAFE = True
-        pyautogui.PAUSE = 0.1
+        # Blink actions are queued to a dispatcher thread (None = no actions)
+        self.dispatcher = dispatcher
         
         self.simulate_enter = True
         
@@ -71,12 +71,14 @@ class BlinkDetector:
                     self.total_blinks += 1
                     
                     # Trigger keyboard action
-                    if self.simulate_enter:
-                        try:
-                            pyautogui.press('enter')
-                            print(f"[ACTION] Blink #{self.total_blinks} detected! Enter key pressed.")
-                        except Exception as e:
-                            print(f"[ERROR] Failed to simulate Enter key: {e}")
+                    if self.simulate_enter and self.dispatcher is not None:
+                        queued = self.dispatcher.dispatch({'type': 'blink', 'time': time.time(),
+                                                           'count': self.total_blinks})
+                        if queued:
+                            print(f"[ACTION] Blink #{self.total_blinks} detected! Enter key queued.")
+                        else:
+                            print(f"[ACTION] Blink #{self.total_blinks} detected! "
+                                  f"Enter key skipped (debounced or queue full).")
                 
                 self.eye_closed_frames = 0
             
@@ -100,8 +102,9 @@ def main():
     print("[INFO] Starting OpenCV-based blink detection...")
     print("[INFO] Press 'q' to quit, 's' to toggle Enter key simulation")
     
-    # Initialize blink detector
-    detector = BlinkDetector()
+    # Initialize blink detector; Enter presses run in the dispatcher thread
+    dispatcher = ActionDispatcher([KeypressSink('enter')]).start()
+    detector = BlinkDetector(dispatcher)
     
     # Start video stream
     vs = VideoStream(src=0).start()
@@ -112,6 +115,7 @@ def main():
     if test_frame is None:
         print("[ERROR] Cannot access camera")
         vs.stop()
+        dispatcher.stop()
         return
     
     print(f"[INFO] Camera working! Frame shape: {test_frame.shape}")
@@ -144,6 +148,7 @@ def main():
     print("[INFO] Cleaning up...")
     cv2.destroyAllWindows()
     vs.stop()
+    dispatcher.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,142 @@
+"""
+Blink State Machine Module
+Reusable blink detection engine with smoothing, hysteresis and time-based durations
+
+Works on any per-frame "eye openness" signal: the eye aspect ratio (EAR) from
+dlib landmarks, or the Haar eye count mapped to 0..1. Blink durations are
+measured in milliseconds from sample timestamps, so results do not change
+when the frame rate varies.
+"""
+
+import bisect
+import collections
+import time
+
+
+OPEN = 'open'
+CLOSED = 'closed'
+
+
+BlinkEvent = collections.namedtuple('BlinkEvent', ['start', 'end', 'duration_ms', 'min_value', 'count'])
+BlinkEvent.__doc__ = """Completed blink: start/end timestamps (s), duration, lowest smoothed value and blink number"""
+
+
+class BlinkStateMachine:
+    def __init__(self, close_threshold=0.25, open_threshold=0.27, smoothing='ema',
+                 ema_alpha=0.5, window=3, min_blink_ms=80, max_blink_ms=500):
+        """
+        Initialize the blink state machine
+
+        Args:
+            close_threshold (float): Smoothed value below which the eye counts as closed
+            open_threshold (float): Smoothed value above which a closed eye counts as
+                open again (>= close_threshold; the gap is the hysteresis band)
+            smoothing (str): 'ema', 'median' or None
+            ema_alpha (float): Weight of the newest sample for EMA smoothing
+            window (int): Ring buffer size for median smoothing
+            min_blink_ms (float): Shorter closures are treated as noise
+            max_blink_ms (float): Longer closures are not blinks (e.g. eyes shut, looking down)
+        """
+        if open_threshold < close_threshold:
+            raise ValueError("open_threshold must be >= close_threshold")
+        if smoothing not in ('ema', 'median', None):
+            raise ValueError(f"Unknown smoothing mode: {smoothing}")
+
+        self.close_threshold = close_threshold
+        self.open_threshold = open_threshold
+        self.smoothing = smoothing
+        self.ema_alpha = ema_alpha
+        self.window = window
+        self.min_blink_ms = min_blink_ms
+        self.max_blink_ms = max_blink_ms
+
+        self.reset()
+
+    @classmethod
+    def for_eye_count(cls, min_blink_ms=80, max_blink_ms=500):
+        """
+        State machine for the Haar eye-count signal (2 eyes = 1.0, 1 = 0.5, 0 = 0.0),
+        closed whenever fewer than two eyes are found
+        """
+        return cls(close_threshold=0.75, open_threshold=0.75, smoothing=None,
+                   min_blink_ms=min_blink_ms, max_blink_ms=max_blink_ms)
+
+    def reset(self):
+        """Reset state, smoothing history and blink count"""
+        self.state = OPEN
+        self.total_blinks = 0
+        self.value = None
+        self.closed_since = None
+        self.closed_samples = 0
+        self.min_value = None
+
+        # Ring buffer plus a sorted copy for O(window) median updates
+        self.ring = [0.0] * self.window
+        self.ring_index = 0
+        self.ring_count = 0
+        self.sorted_window = []
+
+    def _smooth(self, sample):
+        """Update and return the smoothed value"""
+        if self.smoothing == 'ema':
+            if self.value is None:
+                return sample
+            return self.ema_alpha * sample + (1.0 - self.ema_alpha) * self.value
+
+        if self.smoothing == 'median':
+            if self.ring_count == self.window:
+                oldest = self.ring[self.ring_index]
+                del self.sorted_window[bisect.bisect_left(self.sorted_window, oldest)]
+            else:
+                self.ring_count += 1
+            self.ring[self.ring_index] = sample
+            self.ring_index = (self.ring_index + 1) % self.window
+            bisect.insort(self.sorted_window, sample)
+            return self.sorted_window[len(self.sorted_window) // 2]
+
+        return sample
+
+    def update(self, sample, timestamp=None):
+        """
+        Feed one sample
+
+        Args:
+            sample (float): Eye openness (e.g. mean EAR) for this frame
+            timestamp (float): Sample time in seconds (default: time.monotonic())
+
+        Returns:
+            BlinkEvent if a blink just completed, otherwise None
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        self.value = value = self._smooth(sample)
+
+        if self.state == OPEN:
+            if value < self.close_threshold:
+                self.state = CLOSED
+                self.closed_since = timestamp
+                self.closed_samples = 1
+                self.min_value = value
+            return None
+
+        # Eye is closed
+        if value <= self.open_threshold:
+            self.closed_samples += 1
+            self.min_value = min(self.min_value, value)
+            return None
+
+        # Eye reopened - decide whether the closure was a blink
+        self.state = OPEN
+        self.closed_samples = 0
+        duration_ms = (timestamp - self.closed_since) * 1000.0
+
+        if self.min_blink_ms <= duration_ms <= self.max_blink_ms:
+            self.total_blinks += 1
+            return BlinkEvent(self.closed_since, timestamp, duration_ms,
+                              self.min_value, self.total_blinks)
+        return None
+
+    def is_closed(self):
+        """True while the eye is in the closed state"""
+        return self.state == CLOSED
@@ -0,0 +1,181 @@
+"""
+Calibration Module
+Per-user adaptive EAR threshold calibration using streaming quantiles
+
+The open-eye EAR differs between people, cameras and lighting, so a fixed
+EYE_AR_THRESH either misses blinks or mis-triggers. The calibrator estimates
+the open-eye EAR from the first seconds of a session with the P-square
+streaming quantile algorithm (constant memory, no stored samples) and derives
+the close/open thresholds from it. Afterwards it keeps tracking the open-eye
+EAR slowly, so thresholds follow gradual lighting changes.
+"""
+
+import time
+
+
+class P2Quantile:
+    """Streaming quantile estimate with five markers (Jain & Chlamtac P-square)"""
+
+    def __init__(self, quantile=0.5):
+        """
+        Args:
+            quantile (float): Quantile to estimate, in (0, 1)
+        """
+        self.p = quantile
+        self.count = 0
+        self.heights = []
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0.0, 2 * quantile, 4 * quantile, 2 + 2 * quantile, 4.0]
+        self.increments = [0.0, quantile / 2.0, quantile, (1 + quantile) / 2.0, 1.0]
+
+    def add(self, x):
+        """Add one sample"""
+        self.count += 1
+
+        # Collect the first five samples as initial marker heights
+        if self.count <= 5:
+            self.heights.append(x)
+            if self.count == 5:
+                self.heights.sort()
+            return
+
+        q = self.heights
+        n = self.positions
+
+        # Find the cell containing x, extending the extremes if needed
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Adjust the three middle markers towards their desired positions
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = self._parabolic(i, d)
+                if q[i - 1] < candidate < q[i + 1]:
+                    q[i] = candidate
+                else:
+                    q[i] = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                n[i] += d
+
+    def _parabolic(self, i, d):
+        """Piecewise-parabolic prediction of marker i moved by d"""
+        q = self.heights
+        n = self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    def value(self):
+        """Current quantile estimate (None before the first sample)"""
+        if not self.heights:
+            return None
+        if self.count < 5:
+            ordered = sorted(self.heights)
+            return ordered[int(self.p * (len(ordered) - 1))]
+        return self.heights[2]
+
+
+class EARCalibrator:
+    def __init__(self, warmup_seconds=5.0, quantile=0.5, threshold_ratio=0.75,
+                 hysteresis=0.02, adapt_rate=0.01, min_threshold=0.12, max_threshold=0.35):
+        """
+        Initialize the EAR calibrator
+
+        Args:
+            warmup_seconds (float): Length of the initial calibration phase
+            quantile (float): Quantile of the EAR distribution taken as the
+                open-eye level (the median is robust to the few blink frames)
+            threshold_ratio (float): Close threshold as a fraction of the open-eye EAR
+            hysteresis (float): Open threshold = close threshold + hysteresis
+            adapt_rate (float): Step size for tracking the open-eye EAR after
+                warm-up (0 disables recalibration)
+            min_threshold (float): Lower bound for the derived close threshold
+            max_threshold (float): Upper bound for the derived close threshold
+        """
+        self.warmup_seconds = warmup_seconds
+        self.quantile = quantile
+        self.threshold_ratio = threshold_ratio
+        self.hysteresis = hysteresis
+        self.adapt_rate = adapt_rate
+        self.min_threshold = min_threshold
+        self.max_threshold = max_threshold
+
+        self.reset()
+
+    def reset(self):
+        """Start a new calibration (e.g. for a new user)"""
+        self.estimator = P2Quantile(self.quantile)
+        self.started_at = None
+        self.calibrated = False
+        self.open_ear = None
+        self.close_threshold = None
+        self.open_threshold = None
+
+    def update(self, ear, timestamp=None, eye_closed=False):
+        """
+        Feed one EAR sample
+
+        Args:
+            ear (float): Mean eye aspect ratio for this frame
+            timestamp (float): Sample time in seconds (default: time.monotonic())
+            eye_closed (bool): True while the blink state machine reports a
+                closed eye; such samples are not used after warm-up
+
+        Returns:
+            bool: True if the thresholds changed
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if self.started_at is None:
+            self.started_at = timestamp
+
+        if not self.calibrated:
+            self.estimator.add(ear)
+            if timestamp - self.started_at < self.warmup_seconds or self.estimator.count < 5:
+                return False
+
+            self.calibrated = True
+            self.open_ear = self.estimator.value()
+            return self._derive_thresholds()
+
+        if eye_closed or not self.adapt_rate:
+            return False
+
+        # Stochastic quantile tracking: constant memory, follows slow drift
+        step = self.adapt_rate * self.open_ear
+        if ear > self.open_ear:
+            self.open_ear += step * self.quantile
+        else:
+            self.open_ear -= step * (1.0 - self.quantile)
+        return self._derive_thresholds()
+
+    def _derive_thresholds(self):
+        """Compute thresholds from the open-eye EAR; returns True if they changed"""
+        close_threshold = min(self.max_threshold,
+                              max(self.min_threshold, self.open_ear * self.threshold_ratio))
+        open_threshold = close_threshold + self.hysteresis
+
+        changed = (close_threshold, open_threshold) != (self.close_threshold, self.open_threshold)
+        self.close_threshold = close_threshold
+        self.open_threshold = open_threshold
+        return changed
+
+    def apply(self, state_machine):
+        """Copy the calibrated thresholds to a BlinkStateMachine"""
+        if self.calibrated:
+            state_machine.close_threshold = self.close_threshold
+            state_machine.open_threshold = self.open_threshold
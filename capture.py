@@ -0,0 +1,162 @@
+"""
+Threaded Capture Module
+Reads camera frames in a background thread so detection always gets the newest frame
+"""
+
+import collections
+import threading
+import time
+
+import cv2
+
+
+class ThreadedCapture:
+    def __init__(self, camera, buffer_size=1, read_timeout=1.0):
+        """
+        Initialize the threaded capture stage
+
+        Wraps any camera object with start(), stop() and read_frame() (such as
+        CameraManager) and exposes the same interface, so it can be swapped in
+        without changing the detection loop.
+
+        Args:
+            camera: Underlying camera providing start(), stop() and read_frame()
+            buffer_size (int): Frames kept for the consumer; when full the
+                oldest frame is dropped (1 = always hand over the newest frame)
+            read_timeout (float): Seconds read_frame() waits for a new frame
+        """
+        self.camera = camera
+        self.buffer_size = buffer_size
+        self.read_timeout = read_timeout
+
+        # Ring buffer of (capture_time, frame) with drop-oldest policy
+        self.buffer = collections.deque(maxlen=buffer_size)
+        self.condition = threading.Condition()
+        self.thread = None
+        self.running = False
+
+        # Statistics
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.last_capture_time = None
+
+    def start(self):
+        """Start the camera and the capture thread"""
+        self.camera.start()
+
+        self.buffer.clear()
+        self.running = True
+        self.thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop the capture thread and the camera"""
+        self.running = False
+        with self.condition:
+            self.condition.notify_all()
+
+        if self.thread is not None:
+            self.thread.join(timeout=self.read_timeout)
+            self.thread = None
+
+        self.camera.stop()
+
+    def _capture_loop(self):
+        """Continuously read frames, keeping only the newest buffer_size"""
+        while self.running:
+            frame = self.camera.read_frame()
+            if frame is None:
+                # Avoid spinning on a camera that is not delivering frames
+                time.sleep(0.005)
+                continue
+
+            with self.condition:
+                if len(self.buffer) == self.buffer.maxlen:
+                    self.frames_dropped += 1
+                self.buffer.append((time.perf_counter(), frame))
+                self.frames_captured += 1
+                self.condition.notify()
+
+    def read_frame(self):
+        """
+        Get the oldest frame still buffered, waiting briefly for a new one
+
+        Returns:
+            Frame, or None if no new frame arrived within read_timeout
+        """
+        with self.condition:
+            if not self.buffer:
+                self.condition.wait_for(lambda: self.buffer or not self.running,
+                                        timeout=self.read_timeout)
+            if not self.buffer:
+                return None
+
+            self.last_capture_time, frame = self.buffer.popleft()
+            return frame
+
+    def frame_age(self):
+        """Seconds since the last returned frame was captured"""
+        if self.last_capture_time is None:
+            return 0.0
+        return time.perf_counter() - self.last_capture_time
+
+    def get_stats(self):
+        """
+        Get capture statistics
+
+        Returns:
+            dict: Captured and dropped frame counts
+        """
+        return {
+            'frames_captured': self.frames_captured,
+            'frames_dropped': self.frames_dropped,
+            'buffered': len(self.buffer)
+        }
+
+
+class OpenCVCamera:
+    def __init__(self, src=0, width=600):
+        """
+        Minimal camera reading straight from cv2.VideoCapture
+
+        Has the same start()/stop()/read_frame() interface as CameraManager but
+        no display or GUI dependencies, for headless use.
+
+        Args:
+            src: Camera index or stream URL
+            width (int): Output frame width (aspect ratio kept)
+        """
+        self.src = src
+        self.width = width
+        self.capture = None
+
+    def start(self):
+        """Open the camera"""
+        self.capture = cv2.VideoCapture(self.src)
+        if not self.capture.isOpened():
+            raise IOError(f"Cannot open camera: {self.src}")
+        return self
+
+    def stop(self):
+        """Release the camera"""
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+
+    def read_frame(self):
+        """
+        Read and resize one frame
+
+        Returns:
+            Frame, or None if the camera returned nothing
+        """
+        grabbed, frame = self.capture.read()
+        if not grabbed:
+            return None
+
+        h, w = frame.shape[:2]
+        if w != self.width:
+            frame = cv2.resize(frame, (self.width, int(h * (self.width / float(w)))),
+                               interpolation=cv2.INTER_AREA)
+        return frame
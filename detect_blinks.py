@@ -3,7 +3,6 @@
 # python detect_blinks.py --shape-predictor shape_predictor_68_face_landmarks.dat
 
 # import the necessary packages
-from scipy.spatial import distance as dist
 from imutils.video import FileVideoStream
 from imutils.video import VideoStream
 from imutils import face_utils
@@ -14,22 +13,11 @@ import time
 import dlib
 import cv2
 
-def eye_aspect_ratio(eye):
-	# compute the euclidean distances between the two sets of
-	# vertical eye landmarks (x, y)-coordinates
-	A = dist.euclidean(eye[1], eye[5])
-	B = dist.euclidean(eye[2], eye[4])
+from blink_state import BlinkStateMachine
+from calibration import EARCalibrator
+from ear import eye_aspect_ratio
+from face_tracks import MultiFaceTracker
 
-	# compute the euclidean distance between the horizontal
-	# eye landmark (x, y)-coordinates
-	C = dist.euclidean(eye[0], eye[3])
-
-	# compute the eye aspect ratio
-	ear = (A + B) / (2.0 * C)
-
-	# return the eye aspect ratio
-	return ear
- 
 # construct the argument parse and parse the arguments
 ap = argparse.ArgumentParser()
 ap.add_argument("-p", "--shape-predictor", required=True,
@@ -38,15 +26,34 @@ ap.add_argument("-v", "--video", type=str, default="",
 	help="path to input video file")
 args = vars(ap.parse_args())
  
-# define two constants, one for the eye aspect ratio to indicate
-# blink and then a second constant for the number of consecutive
-# frames the eye must be below the threshold
+# define the eye aspect ratio thresholds that close and reopen
+# the eye (the gap between them avoids flicker), and the range
+# of closure durations that count as a blink
 EYE_AR_THRESH = 0.3
-EYE_AR_CONSEC_FRAMES = 3
-
-# initialize the frame counters and the total number of blinks
-COUNTER = 0
-TOTAL = 0
+EYE_AR_OPEN_THRESH = 0.32
+MIN_BLINK_MS = 80
+MAX_BLINK_MS = 500
+
+def create_blink_state():
+	# blink state machine for one person, which also keeps that
+	# person's number of blinks
+	return BlinkStateMachine(close_threshold=EYE_AR_THRESH,
+		open_threshold=EYE_AR_OPEN_THRESH, min_blink_ms=MIN_BLINK_MS,
+		max_blink_ms=MAX_BLINK_MS)
+
+# give every face a stable ID and its own blink state machine, so
+# two people in the video never corrupt each other's blink counts,
+# and keep the total number of blinks of everyone
+face_tracks = MultiFaceTracker(engine_factory=create_blink_state)
+total_blinks = 0
+
+# calibrate the thresholds to each person in the video: their
+# open-eye EAR is measured over the first CALIBRATION_SECONDS, after
+# which the thresholds follow it slowly (EYE_AR_THRESH is only used
+# until then, or always if AUTO_CALIBRATE is False)
+AUTO_CALIBRATE = True
+CALIBRATION_SECONDS = 5.0
+calibrators = {}
 
 # initialize dlib's face detector (HOG-based) and then create
 # the facial landmark predictor
@@ -68,6 +75,11 @@ fileStream = True
 # fileStream = False
 time.sleep(1.0)
 
+# blink durations are measured on the video's own timeline, so
+# results do not depend on how fast frames are processed
+videoFPS = vs.stream.get(cv2.CAP_PROP_FPS) or 30.0
+frameIndex = 0
+
 # loop over frames from the video stream
 while True:
 	# if this is a file video stream, then we need to check if
@@ -79,13 +91,18 @@ while True:
 	# it, and convert it to grayscale
 	# channels)
 	frame = vs.read()
+	timestamp = frameIndex / videoFPS
+	frameIndex += 1
 	frame = imutils.resize(frame, width=450)
 	gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
 
 	# detect faces in the grayscale frame
 	rects = detector(gray, 0)
 
-	# loop over the face detections
+	# determine the facial landmarks and the eye aspect ratio of
+	# every face detection
+	shapes = []
+	ears = []
 	for rect in rects:
 		# determine the facial landmarks for the face region, then
 		# convert the facial landmark (x, y)-coordinates to a NumPy
@@ -95,43 +112,52 @@ while True:
 
 		# extract the left and right eye coordinates, then use the
 		# coordinates to compute the eye aspect ratio for both eyes
-		leftEye = shape[lStart:lEnd]
-		rightEye = shape[rStart:rEnd]
-		leftEAR = eye_aspect_ratio(leftEye)
-		rightEAR = eye_aspect_ratio(rightEye)
+		leftEAR = eye_aspect_ratio(shape[lStart:lEnd])
+		rightEAR = eye_aspect_ratio(shape[rStart:rEnd])
 
 		# average the eye aspect ratio together for both eyes
-		ear = (leftEAR + rightEAR) / 2.0
+		shapes.append(shape)
+		ears.append((leftEAR + rightEAR) / 2.0)
+
+	# match the faces to stable IDs and feed each person's eye aspect
+	# ratio to their own blink state machine, which counts a blink
+	# once the eye reopens after a blink-length closure
+	boxes = [(rect.left(), rect.top(), rect.width(), rect.height()) for rect in rects]
+	total_blinks += len(face_tracks.update(boxes, face_ears=ears, timestamp=timestamp))
+
+	for i, (shape, ear) in enumerate(zip(shapes, ears)):
+		track = face_tracks.tracks[face_tracks.face_ids[i]]
+		blink_state = track.engine
 
 		# compute the convex hull for the left and right eye, then
 		# visualize each of the eyes
-		leftEyeHull = cv2.convexHull(leftEye)
-		rightEyeHull = cv2.convexHull(rightEye)
+		leftEyeHull = cv2.convexHull(shape[lStart:lEnd])
+		rightEyeHull = cv2.convexHull(shape[rStart:rEnd])
 		cv2.drawContours(frame, [leftEyeHull], -1, (0, 255, 0), 1)
 		cv2.drawContours(frame, [rightEyeHull], -1, (0, 255, 0), 1)
 
-		# check to see if the eye aspect ratio is below the blink
-		# threshold, and if so, increment the blink frame counter
-		if ear < EYE_AR_THRESH:
-			COUNTER += 1
-
-		# otherwise, the eye aspect ratio is not below the blink
-		# threshold
-		else:
-			# if the eyes were closed for a sufficient number of
-			# then increment the total number of blinks
-			if COUNTER >= EYE_AR_CONSEC_FRAMES:
-				TOTAL += 1
-
-			# reset the eye frame counter
-			COUNTER = 0
-
-		# draw the total number of blinks on the frame along with
-		# the computed eye aspect ratio for the frame
-		cv2.putText(frame, "Blinks: {}".format(TOTAL), (10, 30),
-			cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-		cv2.putText(frame, "EAR: {:.2f}".format(ear), (300, 30),
-			cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+		# adapt this person's thresholds to their open-eye EAR
+		if AUTO_CALIBRATE:
+			calibrator = calibrators.setdefault(track.id,
+				EARCalibrator(warmup_seconds=CALIBRATION_SECONDS))
+			if calibrator.update(ear, timestamp, blink_state.is_closed()):
+				calibrator.apply(blink_state)
+
+		# draw the computed eye aspect ratio of the first face
+		if i == 0:
+			cv2.putText(frame, "EAR: {:.2f}".format(ear), (300, 30),
+				cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+
+	# forget the calibration of people who left
+	for faceID in list(calibrators):
+		if faceID not in face_tracks.tracks:
+			del calibrators[faceID]
+
+	# label every person with their ID and number of blinks, and
+	# draw the total number of blinks of everyone on the frame
+	face_tracks.draw(frame)
+	cv2.putText(frame, "Blinks: {}".format(total_blinks), (10, 30),
+		cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
  
 	# show the frame
 	cv2.imshow("Frame", frame)
@@ -1,29 +1,26 @@
-from scipy.spatial import distance as dist
+from startup import BackgroundLoader, StartupTimer, wait_for_frame
+
+# Started before the remaining imports so they show up in the startup breakdown
+startup = StartupTimer()
+
+# dlib is imported by the background model loader below. cv2 and VideoStream
+# are needed right away to open the camera, so they stay module imports.
 from imutils.video import VideoStream
-from imutils import face_utils
-import time
-import numpy as np
-import imutils
 import cv2
-import dlib
-import pyautogui
 import os
+import time
 
+from action_dispatcher import ActionDispatcher, KeypressSink
+from blink_state import BlinkStateMachine
+from calibration import EARCalibrator
+from ear import LEFT_EYE_IDXS, RIGHT_EYE_IDXS, eye_aspect_ratios
+from face_tracks import MultiFaceTracker
+from frame_buffers import AllocationMonitor, FrameBuffers
+from landmark_batch import LandmarkBatcher
+from landmark_tracking import LandmarkFaceTracker
+import model_manager
 
-def eye_aspect_ratio(eye):
-    """Calculate the Eye Aspect Ratio (EAR) for blink detection"""
-    # Compute the euclidean distances between the two sets of
-    # vertical eye landmarks (x, y)-coordinates
-    A = dist.euclidean(eye[1], eye[5])
-    B = dist.euclidean(eye[2], eye[4])
-
-    # Compute the euclidean distance between the horizontal
-    # eye landmark (x, y)-coordinates
-    C = dist.euclidean(eye[0], eye[3])
-
-    # Compute the eye aspect ratio
-    ear = (A + B) / (2.0 * C)
-    return ear
+startup.mark('imports')
 
 
 # Path to the facial landmark predictor
@@ -36,41 +33,90 @@ if not os.path.exists(SHAPE_PREDICTOR_PATH):
     exit()
 
 # Define constants for blink detection
-EYE_AR_THRESH = 0.25  # Eye aspect ratio threshold for blink detection
-EYE_AR_CONSEC_FRAMES = 3  # Number of consecutive frames the eye must be below threshold
+EYE_AR_THRESH = 0.25       # Smoothed EAR below this closes the eye
+EYE_AR_OPEN_THRESH = 0.27  # Smoothed EAR above this reopens it (hysteresis)
+MIN_BLINK_MS = 80          # Shorter closures are noise
+MAX_BLINK_MS = 500         # Longer closures are not blinks
 
-# Initialize counters
-COUNTER = 0  # Frame counter for consecutive low EAR frames
-TOTAL = 0    # Total number of blinks detected
 
-# Configure pyautogui
-pyautogui.FAILSAFE = True  # Move mouse to top-left corner to abort
-pyautogui.PAUSE = 0.1      # Small pause between actions
+def create_blink_state():
+    """Blink state for one person (smoothing, hysteresis and time-based blink durations)"""
+    return BlinkStateMachine(close_threshold=EYE_AR_THRESH,
+                             open_threshold=EYE_AR_OPEN_THRESH,
+                             min_blink_ms=MIN_BLINK_MS,
+                             max_blink_ms=MAX_BLINK_MS)
 
-print('[INFO] Loading facial landmark predictor...')
-detector = dlib.get_frontal_face_detector()
-predictor = dlib.shape_predictor(SHAPE_PREDICTOR_PATH)
 
-# Get the indexes of the facial landmarks for the left and right eye
-(lStart, lEnd) = face_utils.FACIAL_LANDMARKS_IDXS['left_eye']
-(rStart, rEnd) = face_utils.FACIAL_LANDMARKS_IDXS['right_eye']
+# Every face gets a stable ID and its own blink state, so two people in
+# frame never corrupt each other's blink counts
+face_tracks = MultiFaceTracker(engine_factory=create_blink_state)
+total_blinks = 0  # Blinks of all people
+
+# Per-person threshold calibration: EYE_AR_THRESH is only used until a face's
+# open-eye EAR has been measured over its first CALIBRATION_SECONDS
+AUTO_CALIBRATE = True
+CALIBRATION_SECONDS = 5.0
+calibrators = {}  # Face ID -> EARCalibrator
+
+CAMERA_WARMUP_TIMEOUT = 2.0  # Max seconds to wait for the first camera frame
+
+# Resized and grayscale frames are written into reused buffers. Set
+# TRACK_ALLOCATIONS to print per-frame allocation statistics on exit
+# (tracemalloc slows processing down while enabled).
+buffers = FrameBuffers()
+TRACK_ALLOCATIONS = False
+allocation_monitor = AllocationMonitor() if TRACK_ALLOCATIONS else None
+
+# Landmark-only tracking: between HOG detections, the face rectangle is derived
+# from the previous frame's landmarks. HOG still runs every REDETECT_INTERVAL
+# frames, when no face is tracked, or when the landmarks drift or collapse.
+LANDMARK_TRACKING = True
+REDETECT_INTERVAL = 30
+
+# Key presses run in a dispatcher thread (which also imports pyautogui in the
+# background), so pyautogui's pause never stalls the frame loop
+dispatcher = ActionDispatcher([KeypressSink('enter')])
+
+
+def load_models():
+    """Import dlib and load its HOG face detector and the landmark predictor"""
+    import dlib
+    return dlib.get_frontal_face_detector(), model_manager.get_shape_predictor(SHAPE_PREDICTOR_PATH)
+
 
 print('[INFO] Starting video stream from webcam...')
 vs = VideoStream(src=0).start()
-time.sleep(2.0)  # Allow camera sensor to warm up
+startup.mark('camera_start')
+
+# Import dlib, load its models and pyautogui while the camera sensor warms up
+dispatcher.start()  # Imports pyautogui in its worker thread
+print('[INFO] Loading dlib face detector and landmark predictor in the background...')
+model_loader = BackgroundLoader(load_models, name="model-loader")
 
-# Test if camera is working
-test_frame = vs.read()
+# Get the indexes of the facial landmarks for the left and right eye
+(lStart, lEnd) = LEFT_EYE_IDXS
+(rStart, rEnd) = RIGHT_EYE_IDXS
+
+# Wait for the first frame instead of a fixed warm-up sleep
+test_frame = wait_for_frame(vs, timeout=CAMERA_WARMUP_TIMEOUT)
+startup.mark('camera_warmup')
 if test_frame is None:
     print("[ERROR] Cannot access camera. Please check if:")
     print("1. Camera is connected and not being used by another application")
     print("2. Camera permissions are granted")
     print("3. Try changing src=0 to src=1 in VideoStream")
     vs.stop()
+    dispatcher.stop()
     exit()
 else:
     print(f"[INFO] Camera working! Frame shape: {test_frame.shape}, dtype: {test_frame.dtype}")
 
+detector, predictor = model_loader.result()
+face_tracker = LandmarkFaceTracker(detector, redetect_interval=REDETECT_INTERVAL)
+batcher = LandmarkBatcher(predictor)
+startup.mark('model_wait')
+model_manager.print_metrics()
+startup.print_report()
 
 print('[INFO] Press "q" to quit, "s" to toggle Enter key simulation')
 simulate_enter = True  # Flag to control Enter key simulation
@@ -83,43 +129,49 @@ while True:
         print("[WARNING] No frame captured from camera")
         continue
 
-    # Resize frame for faster processing
-    frame = imutils.resize(frame, width=450)
-
-    # Convert frame to grayscale
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if allocation_monitor is not None:
+        allocation_monitor.start_frame()
 
-    # Ensure the image is in the correct format for dlib
-    if gray.dtype != np.uint8:
-        gray = gray.astype(np.uint8)
+    # Resize frame for faster processing (into a reused buffer)
+    frame = buffers.resize(frame, width=450)
 
-    # Make sure the image is contiguous in memory
-    if not gray.flags['C_CONTIGUOUS']:
-        gray = np.ascontiguousarray(gray)
+    # Convert frame to grayscale; the buffer is always contiguous uint8,
+    # the format dlib needs, so no extra conversion copies are made
+    gray = buffers.gray(frame)
 
-    # Detect faces in the grayscale frame
+    # Detect faces in the grayscale frame (or reuse the landmark-tracked ones)
     try:
-        rects = detector(gray, 0)
+        rects = face_tracker.rects(gray) if LANDMARK_TRACKING else detector(gray, 0)
     except Exception as e:
         print(f"[ERROR] Face detection failed: {e}")
         print(f"Gray image shape: {gray.shape}, dtype: {gray.dtype}, contiguous: {gray.flags['C_CONTIGUOUS']}")
         continue
 
-    for rect in rects:
-        # Determine the facial landmarks for the face region, then
-        # convert the facial landmark (x, y)-coordinates to a NumPy array
-        shape = predictor(gray, rect)
-        shape = face_utils.shape_to_np(shape)
-
-        # Extract the left and right eye coordinates, then use the
-        # coordinates to compute the eye aspect ratio for both eyes
+    # Determine the facial landmarks for all face regions in one batch,
+    # written straight into a reused (N, 68, 2) array, then compute the
+    # mean eye aspect ratio of every face in one vectorized call
+    landmarks = batcher.predict(gray, rects)
+    found = None
+    if batcher.errors:
+        # Skip only the faces whose prediction failed
+        for i, error in batcher.errors.items():
+            print(f"[WARNING] Landmark detection failed for face {i}: {error}")
+        found = [i for i in range(len(rects)) if i not in batcher.errors]
+        rects, landmarks = [rects[i] for i in found], landmarks[found]
+    _, _, ears = eye_aspect_ratios(landmarks)
+
+    # Match the faces to stable IDs and update each person's own blink state;
+    # an event is returned once a person's eye reopens after a blink-length closure
+    boxes = [(rect.left(), rect.top(), rect.width(), rect.height()) for rect in rects]
+    events = dict(face_tracks.update(boxes, face_ears=[float(ear) for ear in ears]))
+
+    for i, (shape, ear) in enumerate(zip(landmarks, ears)):
+        track = face_tracks.tracks[face_tracks.face_ids[i]]
+        blink_state = track.engine
+
+        # Extract the left and right eye coordinates
         leftEye = shape[lStart:lEnd]
         rightEye = shape[rStart:rEnd]
-        leftEAR = eye_aspect_ratio(leftEye)
-        rightEAR = eye_aspect_ratio(rightEye)
-
-        # Average the eye aspect ratio together for both eyes
-        ear = (leftEAR + rightEAR) / 2.0
 
         # Compute the convex hull for the left and right eye, then
         # visualize each of the eyes
@@ -128,39 +180,58 @@ while True:
         cv2.drawContours(frame, [leftEyeHull], -1, (0, 255, 0), 1)
         cv2.drawContours(frame, [rightEyeHull], -1, (0, 255, 0), 1)
 
-        # Check to see if the eye aspect ratio is below the blink threshold
-        if ear < EYE_AR_THRESH:
-            COUNTER += 1
-        else:
-            # If the eyes were closed for a sufficient number of frames
-            # then increment the total number of blinks
-            if COUNTER >= EYE_AR_CONSEC_FRAMES:
-                TOTAL += 1
-
-                # Trigger keyboard action when blink is detected
-                if simulate_enter:
-                    try:
-                        pyautogui.press('enter')
-                        print(f"[ACTION] Blink #{TOTAL} detected! Enter key pressed.")
-                    except Exception as e:
-                        print(f"[ERROR] Failed to simulate Enter key: {e}")
-
-            # Reset the eye frame counter
-            COUNTER = 0
-
-        # Draw the total number of blinks on the frame along with
-        # the computed eye aspect ratio for the frame
-        cv2.putText(frame, "Blinks: {}".format(TOTAL), (10, 30),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-        cv2.putText(frame, "EAR: {:.2f}".format(ear), (300, 30),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-        cv2.putText(frame, "Threshold: {:.2f}".format(EYE_AR_THRESH), (10, 60),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
-
-        # Show simulation status
-        status = "ON" if simulate_enter else "OFF"
-        cv2.putText(frame, f"Enter Sim: {status}", (10, 90),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
+        # Adapt the thresholds to this person's open-eye EAR and lighting
+        calibrator = calibrators.setdefault(track.id, EARCalibrator(warmup_seconds=CALIBRATION_SECONDS))
+        if AUTO_CALIBRATE and calibrator.update(ear, eye_closed=blink_state.is_closed()):
+            calibrator.apply(blink_state)
+
+        event = events.get(track.id)
+        if event is not None:
+            total_blinks += 1
+
+            # Trigger keyboard action when blink is detected
+            if simulate_enter:
+                queued = dispatcher.dispatch({'type': 'blink', 'time': time.time(), 'face': track.id,
+                                              'count': event.count, 'duration_ms': event.duration_ms})
+                if queued:
+                    print(f"[ACTION] Person {track.id} blink #{event.count} detected! Enter key queued.")
+                else:
+                    print(f"[ACTION] Person {track.id} blink #{event.count} detected! "
+                          f"Enter key skipped (debounced or queue full).")
+
+        # Show the EAR and threshold of the first face
+        if i == 0:
+            cv2.putText(frame, "EAR: {:.2f}".format(ear), (300, 30),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+            calibrating = AUTO_CALIBRATE and not calibrator.calibrated
+            threshold_text = "Threshold: {:.2f}{}".format(
+                blink_state.close_threshold, " (calibrating)" if calibrating else "")
+            cv2.putText(frame, threshold_text, (10, 60),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
+
+    # Forget the calibration of people who left
+    for face_id in list(calibrators):
+        if face_id not in face_tracks.tracks:
+            del calibrators[face_id]
+
+    # Label every person with their ID and blink count, and draw the
+    # total number of blinks of everyone seen so far
+    face_tracks.draw(frame)
+    cv2.putText(frame, "Blinks: {}".format(total_blinks), (10, 30),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+
+    # Show simulation status
+    status = "ON" if simulate_enter else "OFF"
+    cv2.putText(frame, f"Enter Sim: {status}", (10, 90),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
+
+    # Next frame's face rectangles come from this frame's landmarks (found
+    # pairs each landmark set with its own rectangle when faces were skipped)
+    if LANDMARK_TRACKING:
+        face_tracker.update(landmarks, gray.shape, indices=found)
+
+    if allocation_monitor is not None:
+        allocation_monitor.end_frame()
 
     # Show the frame
     cv2.imshow("Eye Blink Detection", frame)
@@ -176,6 +247,13 @@ while True:
 
 
 # Cleanup
+if allocation_monitor is not None:
+    stats = allocation_monitor.get_stats()
+    print(f"[INFO] Per-frame allocations: mean {stats.get('mean_kb')} KB, max {stats.get('max_kb')} KB")
+if LANDMARK_TRACKING:
+    print(f"[INFO] HOG detection ran on {face_tracker.detection_ratio() * 100:.1f}% of frames")
 print("[INFO] Cleaning up...")
 cv2.destroyAllWindows()
 vs.stop()
+dispatcher.stop()
+batcher.close()
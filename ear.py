@@ -0,0 +1,61 @@
+"""
+Eye Aspect Ratio Module
+Vectorized EAR computation over batches of 68-point facial landmarks
+"""
+
+import numpy as np
+
+
+# Eye index ranges in the 68-point landmark model
+# (same as imutils.face_utils.FACIAL_LANDMARKS_IDXS)
+RIGHT_EYE_IDXS = (36, 42)
+LEFT_EYE_IDXS = (42, 48)
+
+# Landmark pairs for the two vertical distances and the horizontal distance
+_EAR_POINTS_A = [1, 2, 0]
+_EAR_POINTS_B = [5, 4, 3]
+
+
+def _batch_ear(eyes):
+    """
+    Compute the EAR for an (N, 6, 2) array of eye landmarks
+
+    Returns:
+        np.ndarray: (N,) eye aspect ratios
+    """
+    diffs = eyes[:, _EAR_POINTS_A] - eyes[:, _EAR_POINTS_B]
+    dists = np.sqrt(np.einsum('nij,nij->ni', diffs, diffs))
+    return (dists[:, 0] + dists[:, 1]) / (2.0 * dists[:, 2])
+
+
+def eye_aspect_ratio(eye):
+    """
+    Calculate the Eye Aspect Ratio (EAR) for a single eye
+
+    Args:
+        eye: (6, 2) array of eye landmark (x, y)-coordinates
+
+    Returns:
+        float: Eye aspect ratio
+    """
+    eye = np.asarray(eye, dtype=np.float64)
+    return float(_batch_ear(eye[np.newaxis])[0])
+
+
+def eye_aspect_ratios(landmarks):
+    """
+    Calculate left, right and mean EAR for many faces or frames in one call
+
+    Args:
+        landmarks: (N, 68, 2) landmark array, or a single (68, 2) face
+
+    Returns:
+        tuple: (left_ear, right_ear, mean_ear), each an (N,) array
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float64)
+    if landmarks.ndim == 2:
+        landmarks = landmarks[np.newaxis]
+
+    left_ear = _batch_ear(landmarks[:, LEFT_EYE_IDXS[0]:LEFT_EYE_IDXS[1]])
+    right_ear = _batch_ear(landmarks[:, RIGHT_EYE_IDXS[0]:RIGHT_EYE_IDXS[1]])
+    return left_ear, right_ear, (left_ear + right_ear) / 2.0
@@ -0,0 +1,206 @@
+"""
+Event Server Module
+Streams blink events and detection metrics to local subscribers
+
+EventServer runs an asyncio TCP (or Unix socket) server in a background
+thread. Every connected client receives newline-delimited JSON messages:
+
+    {"type": "blink", "time": 1712.53, "count": 4, "duration_ms": 140.0}
+    {"type": "frame", "time": 1712.60, "faces": 1, "eyes": 2, "ear": null,
+     "fps": 29.8, "total_blinks": 4}
+
+Frame metrics are sent at most every metrics_interval seconds. Each client has
+its own bounded queue; when a slow client falls behind, its oldest messages
+are dropped, so neither other clients nor the detection loop ever wait.
+
+Try it with:
+    python main.py --serve 127.0.0.1:8765
+    nc 127.0.0.1 8765
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+
+class EventServer:
+    def __init__(self, host='127.0.0.1', port=8765, unix_path=None, queue_size=100,
+                 metrics_interval=0.2):
+        """
+        Initialize the event server
+
+        Args:
+            host (str): TCP host to bind (local only by default)
+            port (int): TCP port (0 = pick a free port, see address)
+            unix_path (str): Serve on this Unix socket path instead of TCP
+            queue_size (int): Messages buffered per client before the oldest are dropped
+            metrics_interval (float): Minimum seconds between frame metric messages
+        """
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.queue_size = queue_size
+        self.metrics_interval = metrics_interval
+
+        self.loop = None
+        self.thread = None
+        self.ready = threading.Event()
+        self.stopping = None
+        self.error = None
+        self.address = None
+
+        # Client writer -> message queue (only touched on the event loop)
+        self.clients = {}
+
+        # Frame rate estimate for the metrics messages
+        self.last_frame_time = None
+        self.last_metrics_time = None
+        self.fps = None
+
+        # Statistics
+        self.messages_dropped = 0
+        self.clients_served = 0
+
+    def start(self, timeout=5.0):
+        """
+        Start serving in a background thread
+
+        Returns:
+            EventServer: self; raises the bind error if the server could not start
+        """
+        self.thread = threading.Thread(target=lambda: asyncio.run(self._serve()),
+                                       name="event-server", daemon=True)
+        self.thread.start()
+        self.ready.wait(timeout)
+        if self.error is not None:
+            raise self.error
+        return self
+
+    def stop(self, timeout=2.0):
+        """Disconnect all clients and stop the server"""
+        if self.loop is not None and self.stopping is not None:
+            self.loop.call_soon_threadsafe(self.stopping.set)
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
+
+    async def _serve(self):
+        self.loop = asyncio.get_running_loop()
+        self.stopping = asyncio.Event()
+
+        try:
+            if self.unix_path:
+                server = await asyncio.start_unix_server(self._handle_client, path=self.unix_path)
+            else:
+                server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        except OSError as e:
+            self.error = e
+            self.ready.set()
+            return
+
+        self.address = server.sockets[0].getsockname()
+        self.ready.set()
+
+        async with server:
+            await self.stopping.wait()
+            # End every client handler so the server can close
+            for queue in self.clients.values():
+                self._put_drop_oldest(queue, None)
+
+    async def _handle_client(self, reader, writer):
+        """Send queued messages to one client until it disconnects"""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.clients[writer] = queue
+        self.clients_served += 1
+
+        try:
+            while True:
+                line = await queue.get()
+                if line is None:
+                    break
+                writer.write(line)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            del self.clients[writer]
+            writer.close()
+
+    def _put_drop_oldest(self, queue, line):
+        """Queue a message, discarding the oldest one if the client is behind"""
+        if queue.full():
+            queue.get_nowait()
+            self.messages_dropped += 1
+        queue.put_nowait(line)
+
+    def _broadcast(self, line):
+        for queue in self.clients.values():
+            self._put_drop_oldest(queue, line)
+
+    def publish(self, message):
+        """
+        Send a message to all clients; never blocks (callable from any thread)
+
+        Args:
+            message (dict): JSON-serializable message
+        """
+        if self.loop is None or not self.clients:
+            return
+        line = (json.dumps(message) + '\n').encode('utf-8')
+        self.loop.call_soon_threadsafe(self._broadcast, line)
+
+    def publish_frame(self, eye_tracker, faces, eyes, blink_detected, timestamp=None):
+        """
+        Publish the results of one processed frame
+
+        Sends a 'blink' message when a blink was detected and a 'frame' metrics
+        message at most every metrics_interval seconds.
+
+        Args:
+            eye_tracker (EyeTracker): Tracker that processed the frame
+            faces: Face boxes returned by detect_faces_and_eyes()
+            eyes: Eye boxes returned by detect_faces_and_eyes()
+            blink_detected (bool): Result of process_blink_detection()
+            timestamp (float): Frame time in seconds (default: time.time())
+        """
+        now = time.time() if timestamp is None else timestamp
+
+        if self.last_frame_time is not None and now > self.last_frame_time:
+            instant = 1.0 / (now - self.last_frame_time)
+            self.fps = instant if self.fps is None else 0.9 * self.fps + 0.1 * instant
+        self.last_frame_time = now
+
+        if blink_detected:
+            event = eye_tracker.last_blink_event
+            self.publish({
+                'type': 'blink',
+                'time': now,
+                'count': eye_tracker.total_blinks,
+                'duration_ms': event.duration_ms if event is not None else None
+            })
+
+        if self.last_metrics_time is None or now - self.last_metrics_time >= self.metrics_interval:
+            self.last_metrics_time = now
+            self.publish({
+                'type': 'frame',
+                'time': now,
+                'faces': len(faces),
+                'eyes': len(eyes),
+                'ear': eye_tracker.last_ear,
+                'fps': round(self.fps, 1) if self.fps is not None else None,
+                'total_blinks': eye_tracker.total_blinks
+            })
+
+    def get_stats(self):
+        """
+        Get server statistics
+
+        Returns:
+            dict: Connected clients, clients served and messages dropped for slow clients
+        """
+        return {
+            'clients': len(self.clients),
+            'clients_served': self.clients_served,
+            'messages_dropped': self.messages_dropped
+        }
@@ -0,0 +1,135 @@
+"""
+Eye Backends Module
+Pluggable eye analysis backends for EyeTracker
+
+Both backends share EyeTracker's face detection front end and differ only in
+how they analyse each face box:
+
+    HaarEyeBackend     - Haar eye cascade; blinks inferred from the eye count
+    LandmarkEARBackend - dlib 68-point landmarks; blinks from the eye aspect ratio
+"""
+
+import cv2
+import numpy as np
+
+import model_manager
+from blink_state import BlinkStateMachine
+from ear import LEFT_EYE_IDXS, RIGHT_EYE_IDXS, eye_aspect_ratios
+
+
+class HaarEyeBackend:
+    name = 'haar'
+
+    def load(self):
+        """Nothing extra to load - the eye cascade belongs to EyeTracker"""
+        pass
+
+    def analyze_face(self, tracker, gray, face):
+        """
+        Find the eyes in one face box
+
+        Args:
+            tracker (EyeTracker): Tracker providing the eye search
+            gray: Full grayscale frame
+            face: (x, y, w, h) face box
+
+        Returns:
+            tuple: (eye boxes in frame coordinates, EAR or None, landmarks or None)
+        """
+        x, y, w, h = face
+        eyes = tracker.detect_eyes(gray[y:y + h, x:x + w])
+        return [(x + int(ex), y + int(ey), int(ew), int(eh)) for (ex, ey, ew, eh) in eyes], None, None
+
+    def draw(self, frame, eyes, landmarks):
+        """Draw rectangles around the detected eyes"""
+        for (ex, ey, ew, eh) in eyes:
+            cv2.rectangle(frame, (ex, ey), (ex + ew, ey + eh), (0, 255, 0), 2)
+
+    def openness(self, eye_count, ear):
+        """Eye count mapped to 0..1 (two or more eyes = fully open)"""
+        return min(eye_count, 2) / 2.0
+
+    def create_engine(self, blink_threshold):
+        """None keeps EyeTracker's consecutive-frame logic"""
+        return None
+
+
+class LandmarkEARBackend:
+    name = 'landmark'
+
+    # EAR close threshold used when EyeTracker gets no blink_threshold
+    DEFAULT_EAR_THRESHOLD = 0.25
+
+    def __init__(self, shape_predictor_path=model_manager.SHAPE_PREDICTOR_PATH):
+        """
+        Initialize the landmark backend
+
+        Args:
+            shape_predictor_path (str): Path to the 68-point dlib landmark model
+        """
+        self.shape_predictor_path = shape_predictor_path
+        self.predictor = None
+        self.dlib = None
+
+    def load(self):
+        """Load dlib and the shared landmark predictor"""
+        if self.predictor is None:
+            import dlib
+            self.dlib = dlib
+            self.predictor = model_manager.get_shape_predictor(self.shape_predictor_path)
+
+    def analyze_face(self, tracker, gray, face):
+        """
+        Fit 68 landmarks to one face box and compute its EAR
+
+        Returns:
+            tuple: (eye bounding boxes in frame coordinates, mean EAR, (68, 2) landmarks)
+        """
+        self.load()
+        x, y, w, h = (int(v) for v in face)
+        shape = self.predictor(gray, self.dlib.rectangle(x, y, x + w, y + h))
+        landmarks = np.array([(p.x, p.y) for p in shape.parts()], dtype=np.int32)
+
+        _, _, mean_ear = eye_aspect_ratios(landmarks)
+        left_eye = landmarks[LEFT_EYE_IDXS[0]:LEFT_EYE_IDXS[1]]
+        right_eye = landmarks[RIGHT_EYE_IDXS[0]:RIGHT_EYE_IDXS[1]]
+        eyes = [cv2.boundingRect(left_eye), cv2.boundingRect(right_eye)]
+        return eyes, float(mean_ear[0]), landmarks
+
+    def draw(self, frame, eyes, landmarks):
+        """Draw the convex hull of each eye's landmarks"""
+        for start, end in (LEFT_EYE_IDXS, RIGHT_EYE_IDXS):
+            hull = cv2.convexHull(landmarks[start:end])
+            cv2.drawContours(frame, [hull], -1, (0, 255, 0), 1)
+
+    def openness(self, eye_count, ear):
+        """The EAR itself (None when no face was found)"""
+        return ear
+
+    def create_engine(self, blink_threshold):
+        """EAR blink engine with a small hysteresis band above the close threshold"""
+        threshold = blink_threshold if blink_threshold is not None else self.DEFAULT_EAR_THRESHOLD
+        return BlinkStateMachine(close_threshold=threshold, open_threshold=threshold + 0.02)
+
+
+BACKENDS = {
+    'haar': HaarEyeBackend,
+    'landmark': LandmarkEARBackend
+}
+
+
+def create_backend(backend):
+    """
+    Resolve a backend name or instance
+
+    Args:
+        backend: 'haar', 'landmark' or a backend instance
+
+    Returns:
+        Backend instance
+    """
+    if not isinstance(backend, str):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown eye backend: {backend}")
+    return BACKENDS[backend]()
@@ -3,84 +3,332 @@ Eye Tracker Module
 Handles eye detection and blink detection logic
 """
 
+import threading
+import time
+
 import cv2
 import numpy as np
 
+import model_manager
+from eye_backends import create_backend
+from frame_buffers import FrameBuffers
+from latency import NullProfiler
+
+
+# Vertical band of the face box (fractions of face height) where eyes can be
+EYE_BAND_TOP = 0.15
+EYE_BAND_BOTTOM = 0.6
+
+# Eye box size bounds as fractions of face width
+EYE_MIN_SIZE = 0.12
+EYE_MAX_SIZE = 0.4
+
 
 class EyeTracker:
-    def __init__(self, blink_threshold=0.5, consecutive_frames=3):
+    def __init__(self, blink_threshold=None, consecutive_frames=3,
+                 face_tracking=False, detection_interval=10, roi_padding=0.25,
+                 profiler=None, eye_search='full', detection_scale=1.0,
+                 blink_engine=None, backend='haar'):
         """
         Initialize the eye tracker
         
         Args:
-            blink_threshold (float): Threshold for determining blinks
+            blink_threshold (float): EAR close threshold for the landmark backend
+                (default: 0.25); not used by the Haar backend
             consecutive_frames (int): Number of consecutive frames needed to confirm blink
+            face_tracking (bool): Search only around the previous face boxes between
+                full-frame face detections
+            detection_interval (int): Frames between full-frame face detections
+                when face tracking is enabled
+            roi_padding (float): Padding around the previous face box, as a
+                fraction of its size, for the tracked search window
+            profiler (LatencyProfiler): Records grayscale, face and eye detection
+                timings per frame (default: no profiling)
+            eye_search (str): 'full' searches the whole face box for eyes;
+                'upper' searches only the upper band of the face with eye
+                sizes bounded by the face width (faster, fewer mouth/nostril
+                false positives)
+            detection_scale (float): Scale of the grayscale image used for face
+                detection (e.g. 0.5 or 0.25). Face boxes are re-projected to the
+                input frame and eyes are searched at full resolution.
+            blink_engine (BlinkStateMachine): Time-based blink engine fed with the
+                eye count (see BlinkStateMachine.for_eye_count). When None, blinks
+                are confirmed by consecutive_frames as before.
+            backend: Eye analysis backend, 'haar' (eye cascade, eye-count blinks)
+                or 'landmark' (dlib 68-point landmarks, EAR blinks), or a backend
+                instance from eye_backends. Both share the face detection front end.
         """
-        # Initialize cascade classifiers
-        self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-        self.eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml')
+        # Cascade classifiers are loaded on first use (or by preload())
+        self._face_cascade = None
+        self._eye_cascade = None
+        self._model_lock = threading.Lock()
         
         # Blink detection parameters
         self.blink_threshold = blink_threshold
         self.consecutive_frames = consecutive_frames
         
+        # Face tracking parameters
+        self.face_tracking = face_tracking
+        self.detection_interval = detection_interval
+        self.roi_padding = roi_padding
+        
+        # Face tracking state
+        self.tracked_faces = []
+        self.frames_since_detection = 0
+        self.full_detections = 0
+        
+        # Eye search mode
+        if eye_search not in ('full', 'upper'):
+            raise ValueError(f"Unknown eye search mode: {eye_search}")
+        self.eye_search = eye_search
+        
+        # Face detection resolution relative to the input frame
+        if not 0 < detection_scale <= 1.0:
+            raise ValueError(f"detection_scale must be in (0, 1], got {detection_scale}")
+        self.detection_scale = detection_scale
+        
+        # Per-stage timing
+        self.profiler = profiler or NullProfiler()
+        
+        # Reused grayscale/downscale buffers (no per-frame image allocations)
+        self.buffers = FrameBuffers()
+        
+        # Eye analysis backend
+        self.backend = create_backend(backend)
+        
+        # Time-based blink engine (the landmark backend always uses one)
+        self.blink_engine = blink_engine or self.backend.create_engine(blink_threshold)
+        self.last_blink_event = None
+        self.last_ear = None
+        self.last_landmarks = []
+        
+        # Per-face results of the last frame, in face order (for MultiFaceTracker)
+        self.last_face_eyes = []
+        self.last_face_ears = []
+        
         # State variables
         self.frame_counter = 0
         self.total_blinks = 0
         self.eye_closed_frames = 0
         self.last_eye_count = 0
         
+    def preload(self):
+        """
+        Load the cascade classifiers (and backend models) now instead of on
+        the first frame
+        
+        Models come from model_manager, so all trackers in a process share
+        one copy. Safe to call from a background thread while the camera warms up.
+        
+        Returns:
+            EyeTracker: self
+        """
+        with self._model_lock:
+            if self._face_cascade is None:
+                self._face_cascade = model_manager.get_cascade(model_manager.FACE_CASCADE)
+                self._eye_cascade = model_manager.get_cascade(model_manager.EYE_CASCADE)
+            self.backend.load()
+        return self
+    
+    @property
+    def face_cascade(self):
+        """Haar face cascade, loaded on first access"""
+        if self._face_cascade is None:
+            self.preload()
+        return self._face_cascade
+    
+    @property
+    def eye_cascade(self):
+        """Haar eye cascade, loaded on first access"""
+        if self._eye_cascade is None:
+            self.preload()
+        return self._eye_cascade
+    
     def reset_counters(self):
         """Reset all counters"""
         self.frame_counter = 0
         self.total_blinks = 0
         self.eye_closed_frames = 0
+        self.last_blink_event = None
+        if self.blink_engine is not None:
+            self.blink_engine.reset()
         
-    def detect_faces_and_eyes(self, frame):
+    def reset_tracking(self):
+        """Forget previously tracked faces so the next frame runs full detection"""
+        self.tracked_faces = []
+        self.frames_since_detection = 0
+        
+    def detect_faces_and_eyes(self, frame, draw=True):
         """
         Detect faces and eyes in the frame
         
         Args:
             frame: Input frame from camera
+            draw (bool): Draw face/eye rectangles on the frame. Headless
+                callers pass False to skip the rendering cost.
             
         Returns:
             tuple: (faces, all_eyes, processed_frame)
         """
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
+        with self.profiler.stage('grayscale'):
+            gray = self.buffers.gray(frame)
+        
+        with self.profiler.stage('face_detection'):
+            if self.detection_scale < 1.0:
+                # Detect on a downscaled copy, then map boxes back to the frame
+                small_gray = self.buffers.scale(gray, self.detection_scale)
+                faces = self.scale_boxes(self.detect_faces(small_gray), 1.0 / self.detection_scale)
+            else:
+                faces = self.detect_faces(gray)
         
         all_eyes = []
+        eye_time = 0.0
+        self.last_ear = None
+        self.last_landmarks = []
+        self.last_face_eyes = []
+        self.last_face_ears = []
         
         for (x, y, w, h) in faces:
             # Draw rectangle around face
-            cv2.rectangle(frame, (x, y), (x + w, y + h), (255, 0, 0), 2)
+            if draw:
+                cv2.rectangle(frame, (x, y), (x + w, y + h), (255, 0, 0), 2)
             
-            # Extract face region for eye detection
-            roi_gray = gray[y:y + h, x:x + w]
-            roi_color = frame[y:y + h, x:x + w]
+            # Analyse the face region with the eye backend
+            start = time.perf_counter()
+            eyes, ear, landmarks = self.backend.analyze_face(self, gray, (x, y, w, h))
+            eye_time += time.perf_counter() - start
             
-            # Detect eyes in face region
-            eyes = self.eye_cascade.detectMultiScale(roi_gray, 1.1, 3)
+            # The first face drives the EAR signal
+            if ear is not None and self.last_ear is None:
+                self.last_ear = ear
+            if landmarks is not None:
+                self.last_landmarks.append(landmarks)
+            self.last_face_eyes.append(eyes)
+            self.last_face_ears.append(ear)
             
-            # Draw rectangles around eyes
-            for (ex, ey, ew, eh) in eyes:
-                cv2.rectangle(roi_color, (ex, ey), (ex + ew, ey + eh), (0, 255, 0), 2)
-                # Convert eye coordinates to global frame coordinates
-                global_eye = (x + ex, y + ey, ew, eh)
-                all_eyes.append(global_eye)
+            if draw:
+                self.backend.draw(frame, eyes, landmarks)
+            all_eyes.extend(eyes)
+        
+        # One eye detection sample per frame, summed over all faces
+        self.profiler.add('eye_detection', eye_time)
         
         return faces, all_eyes, frame
     
-    def process_blink_detection(self, eyes):
+    @staticmethod
+    def scale_boxes(boxes, factor):
+        """
+        Scale (x, y, w, h) boxes by a factor
+        
+        Args:
+            boxes: Sequence of (x, y, w, h) boxes
+            factor (float): Scale factor
+            
+        Returns:
+            np.ndarray: Scaled integer boxes, shape (N, 4)
+        """
+        if len(boxes) == 0:
+            return np.empty((0, 4), dtype=int)
+        return np.round(np.asarray(boxes, dtype=np.float64) * factor).astype(int)
+    
+    def detect_eyes(self, roi_gray):
+        """
+        Detect eyes inside a face region
+        
+        Args:
+            roi_gray: Grayscale face region
+            
+        Returns:
+            Sequence of (x, y, w, h) eye boxes relative to the face region
+        """
+        if self.eye_search == 'full':
+            return self.eye_cascade.detectMultiScale(roi_gray, 1.1, 3)
+        
+        # Only the anatomically plausible band, with sizes derived from the face width
+        face_h, face_w = roi_gray.shape[:2]
+        band_top = int(face_h * EYE_BAND_TOP)
+        band_bottom = int(face_h * EYE_BAND_BOTTOM)
+        min_eye = max(1, int(face_w * EYE_MIN_SIZE))
+        max_eye = max(min_eye, int(face_w * EYE_MAX_SIZE))
+        
+        eyes = self.eye_cascade.detectMultiScale(
+            roi_gray[band_top:band_bottom], 1.1, 3,
+            minSize=(min_eye, min_eye), maxSize=(max_eye, max_eye))
+        
+        return [(int(ex), int(ey) + band_top, int(ew), int(eh)) for (ex, ey, ew, eh) in eyes]
+    
+    def detect_faces(self, gray):
+        """
+        Detect faces, either over the full frame or, in face tracking mode,
+        only in padded windows around the previously found faces
+        
+        Args:
+            gray: Grayscale frame
+            
+        Returns:
+            Sequence of (x, y, w, h) face boxes
+        """
+        if not self.face_tracking:
+            return self.face_cascade.detectMultiScale(gray, 1.3, 5)
+        
+        self.frames_since_detection += 1
+        
+        # Full detection on schedule or when there is nothing to track
+        if len(self.tracked_faces) == 0 or self.frames_since_detection >= self.detection_interval:
+            return self._full_face_detection(gray)
+        
+        frame_h, frame_w = gray.shape[:2]
+        faces = []
+        
+        for (x, y, w, h) in self.tracked_faces:
+            # Padded search window around the previous face box
+            pad_x = int(w * self.roi_padding)
+            pad_y = int(h * self.roi_padding)
+            x0 = max(0, x - pad_x)
+            y0 = max(0, y - pad_y)
+            x1 = min(frame_w, x + w + pad_x)
+            y1 = min(frame_h, y + h + pad_y)
+            
+            # Only look for faces of roughly the same size as before
+            min_size = (int(w * 0.7), int(h * 0.7))
+            max_size = (int(w * 1.3), int(h * 1.3))
+            found = self.face_cascade.detectMultiScale(
+                gray[y0:y1, x0:x1], 1.3, 5, minSize=min_size, maxSize=max_size)
+            
+            if len(found) == 0:
+                # Track lost - fall back to full-frame detection
+                return self._full_face_detection(gray)
+            
+            # Keep the largest candidate in the window
+            fx, fy, fw, fh = max(found, key=lambda f: f[2] * f[3])
+            faces.append((x0 + int(fx), y0 + int(fy), int(fw), int(fh)))
+        
+        self.tracked_faces = faces
+        return faces
+    
+    def _full_face_detection(self, gray):
+        """Run full-frame face detection and reset the tracking state"""
+        faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
+        self.tracked_faces = [tuple(int(v) for v in face) for face in faces]
+        self.frames_since_detection = 0
+        self.full_detections += 1
+        return faces
+    
+    def process_blink_detection(self, eyes, timestamp=None):
         """
         Process blink detection based on eye count
         
         Args:
             eyes: List of detected eyes
+            timestamp (float): Frame time in seconds, used by the blink engine
+                (default: current time)
             
         Returns:
             bool: True if a blink was detected, False otherwise
         """
+        if self.blink_engine is not None:
+            return self._process_with_engine(eyes, timestamp)
+        
         blink_detected = False
         
         # Consider it a potential blink if less than 2 eyes are detected
@@ -98,6 +346,25 @@ class EyeTracker:
         self.last_eye_count = len(eyes)
         return blink_detected
     
+    def _process_with_engine(self, eyes, timestamp):
+        """Feed the backend's openness value (eye count or EAR) to the blink engine"""
+        self.last_eye_count = len(eyes)
+        
+        # No face this frame - nothing to measure
+        openness = self.backend.openness(len(eyes), self.last_ear)
+        if openness is None:
+            return False
+        
+        event = self.blink_engine.update(openness, timestamp)
+        self.eye_closed_frames = self.blink_engine.closed_samples
+        
+        if event is None:
+            return False
+        
+        self.total_blinks += 1
+        self.last_blink_event = event
+        return True
+    
     def get_stats(self):
         """
         Get current tracking statistics
@@ -109,7 +376,9 @@ class EyeTracker:
             'total_blinks': self.total_blinks,
             'eye_closed_frames': self.eye_closed_frames,
             'last_eye_count': self.last_eye_count,
-            'consecutive_frames_threshold': self.consecutive_frames
+            'consecutive_frames_threshold': self.consecutive_frames,
+            'backend': self.backend.name,
+            'ear': self.last_ear
         }
     
     def draw_stats(self, frame, additional_info=None):
@@ -129,6 +398,9 @@ class EyeTracker:
                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
         cv2.putText(frame, f"Closed frames: {stats['eye_closed_frames']}", (10, 90), 
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
+        if stats['ear'] is not None:
+            cv2.putText(frame, f"EAR: {stats['ear']:.2f}", (frame.shape[1] - 120, 30), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
         
         # Draw additional info if provided
         if additional_info:
@@ -0,0 +1,228 @@
+"""
+Face Tracks Module
+Stable per-person identities and independent blink state for multiple faces
+
+Each frame's face boxes are matched to the existing tracks by IoU, with a
+centroid-distance fallback for fast motion. Candidate tracks are looked up
+in a uniform grid (spatial hash) of track centroids. The cell size is the
+largest face dimension in the frame, so two overlapping boxes always lie in
+the same or adjacent cells. Matching therefore costs O(faces) rather than
+comparing every face with every track.
+
+Every track owns its own blink engine, so one person's blinks never mix with
+another's.
+"""
+
+import collections
+
+import cv2
+
+from blink_state import BlinkStateMachine
+
+
+class FaceTrack:
+    def __init__(self, track_id, box, engine):
+        """
+        One tracked face
+
+        Args:
+            track_id (int): Stable identity
+            box (tuple): Latest (x, y, w, h) face box
+            engine (BlinkStateMachine): This face's blink engine
+        """
+        self.id = track_id
+        self.box = box
+        self.engine = engine
+        self.eyes = []
+        self.ear = None
+        self.age = 0
+        self.missed = 0
+        self.last_event = None
+
+    @property
+    def total_blinks(self):
+        return self.engine.total_blinks
+
+    def center(self):
+        x, y, w, h = self.box
+        return x + w / 2.0, y + h / 2.0
+
+
+def box_iou(a, b):
+    """Intersection over union of two (x, y, w, h) boxes"""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    iw = min(ax + aw, bx + bw) - max(ax, bx)
+    ih = min(ay + ah, by + bh) - max(ay, by)
+    if iw <= 0 or ih <= 0:
+        return 0.0
+    inter = iw * ih
+    return inter / float(aw * ah + bw * bh - inter)
+
+
+class MultiFaceTracker:
+    def __init__(self, engine_factory=BlinkStateMachine.for_eye_count, openness=None,
+                 iou_threshold=0.3, max_center_shift=0.5, max_missed=10):
+        """
+        Initialize the multi-face tracker
+
+        Args:
+            engine_factory (callable): Creates a blink engine for each new face
+            openness (callable): Maps (eye_count, ear) to the engine's input
+                (default: the EAR when available, else the eye count mapped to 0..1)
+            iou_threshold (float): Minimum IoU to match a face to a track
+            max_center_shift (float): A face that overlaps less still matches a
+                track whose centre is within this fraction of the face size
+            max_missed (int): Frames a track survives without a matching face
+        """
+        self.engine_factory = engine_factory
+        self.openness = openness or self._default_openness
+        self.iou_threshold = iou_threshold
+        self.max_center_shift = max_center_shift
+        self.max_missed = max_missed
+
+        self.reset()
+
+    @classmethod
+    def for_eye_tracker(cls, eye_tracker, **kwargs):
+        """
+        Tracker whose per-face engines and openness signal match an EyeTracker's backend
+
+        Args:
+            eye_tracker (EyeTracker): Tracker providing faces and per-face eyes/EAR
+            **kwargs: Further MultiFaceTracker options
+        """
+        backend = eye_tracker.backend
+
+        def engine_factory():
+            return backend.create_engine(eye_tracker.blink_threshold) or BlinkStateMachine.for_eye_count()
+
+        return cls(engine_factory=engine_factory, openness=backend.openness, **kwargs)
+
+    @staticmethod
+    def _default_openness(eye_count, ear):
+        return ear if ear is not None else min(eye_count, 2) / 2.0
+
+    def reset(self):
+        """Forget all tracks; IDs start again from 1"""
+        self.tracks = collections.OrderedDict()
+        self.next_id = 1
+
+        # Track ID of each face passed to the last update(), in face order
+        self.face_ids = []
+
+    def update(self, faces, face_eyes=None, face_ears=None, timestamp=None):
+        """
+        Match this frame's faces to tracks and update each face's blink state
+
+        Args:
+            faces: Sequence of (x, y, w, h) face boxes
+            face_eyes (list): Eye boxes per face (same order as faces)
+            face_ears (list): EAR per face, or None entries (same order as faces)
+            timestamp (float): Frame time in seconds
+
+        Returns:
+            list: (track_id, BlinkEvent) for every blink completed this frame
+        """
+        faces = [tuple(int(v) for v in face) for face in faces]
+        face_eyes = face_eyes if face_eyes is not None else [[] for _ in faces]
+        face_ears = face_ears if face_ears is not None else [None] * len(faces)
+
+        matches = self._match(faces)
+        events = []
+        seen = set()
+        self.face_ids = []
+
+        for i, box in enumerate(faces):
+            track = matches.get(i)
+            if track is None:
+                track = FaceTrack(self.next_id, box, self.engine_factory())
+                self.tracks[track.id] = track
+                self.next_id += 1
+            seen.add(track.id)
+            self.face_ids.append(track.id)
+
+            track.box = box
+            track.eyes = face_eyes[i]
+            track.ear = face_ears[i]
+            track.age += 1
+            track.missed = 0
+
+            sample = self.openness(len(track.eyes), track.ear)
+            if sample is None:
+                continue
+            event = track.engine.update(sample, timestamp)
+            if event is not None:
+                track.last_event = event
+                events.append((track.id, event))
+
+        # Age out tracks that found no face this frame
+        for track_id in list(self.tracks):
+            if track_id in seen:
+                continue
+            track = self.tracks[track_id]
+            track.missed += 1
+            if track.missed > self.max_missed:
+                del self.tracks[track_id]
+
+        return events
+
+    def _match(self, faces):
+        """
+        Greedy one-to-one matching of faces to tracks using a spatial hash
+
+        Returns:
+            dict: Face index -> matched FaceTrack
+        """
+        if not faces or not self.tracks:
+            return {}
+
+        # Cell size = largest face dimension, so overlapping boxes are in
+        # neighbouring cells
+        cell = max(max(max(w, h) for (_, _, w, h) in faces),
+                   max(max(t.box[2], t.box[3]) for t in self.tracks.values()))
+        cell = max(1, int(cell))
+
+        grid = collections.defaultdict(list)
+        for track in self.tracks.values():
+            cx, cy = track.center()
+            grid[(int(cx // cell), int(cy // cell))].append(track)
+
+        candidates = []
+        for i, box in enumerate(faces):
+            x, y, w, h = box
+            cx, cy = x + w / 2.0, y + h / 2.0
+            gx, gy = int(cx // cell), int(cy // cell)
+            max_shift = self.max_center_shift * max(w, h)
+
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for track in grid.get((gx + dx, gy + dy), ()):
+                        iou = box_iou(box, track.box)
+                        tx, ty = track.center()
+                        shift = ((cx - tx) ** 2 + (cy - ty) ** 2) ** 0.5
+                        if iou >= self.iou_threshold or shift <= max_shift:
+                            candidates.append((iou, -shift, i, track))
+
+        # Best pairs first; each face and each track is used at most once
+        candidates.sort(key=lambda c: (c[0], c[1]), reverse=True)
+        matches = {}
+        used = set()
+        for _, _, i, track in candidates:
+            if i in matches or track.id in used:
+                continue
+            matches[i] = track
+            used.add(track.id)
+        return matches
+
+    def get_tracks(self):
+        """Currently visible tracks (seen this frame)"""
+        return [track for track in self.tracks.values() if track.missed == 0]
+
+    def draw(self, frame):
+        """Label each visible face with its ID and blink count"""
+        for track in self.get_tracks():
+            x, y, w, h = track.box
+            cv2.putText(frame, f"ID {track.id}: {track.total_blinks}", (x, max(15, y - 8)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 2)
+        return frame
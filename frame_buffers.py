@@ -0,0 +1,141 @@
+"""
+Frame Buffers Module
+Preallocated output buffers for the per-frame resize/grayscale path
+
+cv2.resize and cv2.cvtColor allocate a new image on every call unless they are
+given a dst array of the right shape and type. FrameBuffers keeps one named
+buffer per intermediate image and passes it as dst, so steady-state processing
+reuses the same memory every frame and only reallocates when the input size
+changes. AllocationMonitor measures what is still allocated per frame.
+"""
+
+import tracemalloc
+
+import cv2
+import numpy as np
+
+
+class FrameBuffers:
+    def __init__(self):
+        """Initialize an empty buffer pool"""
+        self.buffers = {}
+        self.allocations = 0
+
+    def get(self, name, shape, dtype=np.uint8):
+        """
+        Get a named buffer, allocating it only when the shape or type changed
+
+        Args:
+            name (str): Buffer name (one buffer per pipeline stage)
+            shape (tuple): Required shape
+            dtype: Required NumPy dtype
+
+        Returns:
+            numpy.ndarray: C-contiguous buffer (contents undefined)
+        """
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self.buffers[name] = buffer
+            self.allocations += 1
+        return buffer
+
+    def resize(self, frame, width, name='resized', interpolation=cv2.INTER_AREA):
+        """
+        Resize to a given width keeping the aspect ratio (like imutils.resize)
+
+        Args:
+            frame: Input image
+            width (int): Output width
+            name (str): Buffer name
+            interpolation: OpenCV interpolation flag
+
+        Returns:
+            numpy.ndarray: Resized image in a reused buffer
+        """
+        h, w = frame.shape[:2]
+        height = int(h * (width / float(w)))
+        dst = self.get(name, (height, width) + frame.shape[2:], frame.dtype)
+        cv2.resize(frame, (width, height), dst=dst, interpolation=interpolation)
+        return dst
+
+    def scale(self, frame, factor, name='scaled', interpolation=cv2.INTER_AREA):
+        """
+        Resize by a factor (like cv2.resize(frame, None, fx=factor, fy=factor))
+
+        Returns:
+            numpy.ndarray: Scaled image in a reused buffer
+        """
+        h, w = frame.shape[:2]
+        size = (int(round(w * factor)), int(round(h * factor)))
+        dst = self.get(name, (size[1], size[0]) + frame.shape[2:], frame.dtype)
+        cv2.resize(frame, size, dst=dst, interpolation=interpolation)
+        return dst
+
+    def gray(self, frame, name='gray'):
+        """
+        Convert a BGR frame to grayscale
+
+        Returns:
+            numpy.ndarray: Contiguous uint8 grayscale image in a reused buffer
+                (usable by dlib without further copies)
+        """
+        dst = self.get(name, frame.shape[:2], np.uint8)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=dst)
+        return dst
+
+
+class AllocationMonitor:
+    def __init__(self, window=300):
+        """
+        Measure Python/NumPy memory allocated while processing each frame
+
+        Uses tracemalloc, which slows allocation down noticeably; enable it
+        only when investigating allocations.
+
+        Args:
+            window (int): Number of recent frames kept for the statistics
+        """
+        self.window = window
+        self.samples = []
+        self.base = 0
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def start_frame(self):
+        """Mark the beginning of a frame"""
+        tracemalloc.reset_peak()
+        self.base = tracemalloc.get_traced_memory()[0]
+
+    def end_frame(self):
+        """
+        Mark the end of a frame
+
+        Returns:
+            int: Peak bytes allocated above the frame's starting point
+        """
+        peak = tracemalloc.get_traced_memory()[1]
+        allocated = max(0, peak - self.base)
+        self.samples.append(allocated)
+        if len(self.samples) > self.window:
+            del self.samples[0]
+        return allocated
+
+    def get_stats(self):
+        """
+        Get per-frame allocation statistics over the window
+
+        Returns:
+            dict: 'mean_kb' and 'max_kb' (empty before the first frame)
+        """
+        if not self.samples:
+            return {}
+        return {
+            'mean_kb': round(sum(self.samples) / len(self.samples) / 1024.0, 1),
+            'max_kb': round(max(self.samples) / 1024.0, 1)
+        }
+
+    def stop(self):
+        """Stop tracing"""
+        tracemalloc.stop()
@@ -6,28 +6,52 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import cv2
 from PIL import Image, ImageTk
+import queue
 import threading
 import time
+from capture import ThreadedCapture
 from eye_tracker import EyeTracker
+from latency import LatencyProfiler
+from scheduler import FrameScheduler
+from startup import BackgroundLoader
 from utils import CameraManager, ActionSimulator
 
 
 class BlinkDetectionGUI:
-    def __init__(self, root):
+    def __init__(self, root, display_interval_ms=33, target_fps=30):
         self.root = root
         self.root.title("Eye Blink Detection System")
         self.root.geometry("800x600")
         
         # Initialize components
-        self.eye_tracker = EyeTracker()
-        self.camera = CameraManager(src=0, width=400)
+        self.profiler = LatencyProfiler()
+        self.eye_tracker = EyeTracker(profiler=self.profiler)
+        
+        # Load the cascades in the background so the window appears immediately
+        self.model_loader = BackgroundLoader(self.eye_tracker.preload, name="cascade-loader")
+        self.camera = ThreadedCapture(CameraManager(src=0, width=400))
         self.action_simulator = ActionSimulator(enabled=True)
+        self.scheduler = FrameScheduler(target_fps=target_fps)
         
         # GUI state variables
         self.is_running = False
         self.current_frame = None
         
+        # Display hand-off between the detection thread and the Tk main loop.
+        # The detection thread only fills a single slot (newest frame wins);
+        # the Tk thread polls it every display_interval_ms and reuses one PhotoImage.
+        self.display_interval_ms = display_interval_ms
+        self.display_lock = threading.Lock()
+        self.pending_display = None
+        self.photo = None
+        self.refresh_job = None
+        self.last_latency_update = 0.0
+        
+        # Log messages from worker threads, inserted by the Tk thread
+        self.log_queue = queue.Queue()
+        
         self.setup_gui()
+        self.refresh_display()
         
     def setup_gui(self):
         """Setup the GUI layout"""
@@ -81,6 +105,12 @@ class BlinkDetectionGUI:
         self.status_label = ttk.Label(stats_frame, text="Status: Stopped")
         self.status_label.pack(anchor=tk.W)
         
+        self.fps_label = ttk.Label(stats_frame, text="FPS: -")
+        self.fps_label.pack(anchor=tk.W)
+        
+        self.latency_label = ttk.Label(stats_frame, text="Frame time: -")
+        self.latency_label.pack(anchor=tk.W)
+        
         # Settings frame
         settings_frame = ttk.LabelFrame(control_frame, text="Settings", padding="10")
         settings_frame.pack(pady=10, fill=tk.X)
@@ -93,6 +123,16 @@ class BlinkDetectionGUI:
                                           command=self.update_sensitivity)
         self.sensitivity_scale.pack(fill=tk.X, pady=2)
         
+        # Target detection rate
+        ttk.Label(settings_frame, text="Target FPS:").pack(anchor=tk.W)
+        target = self.scheduler.target_fps
+        self.fps_var = tk.StringVar(value=str(int(target)) if target else "Max")
+        self.fps_combo = ttk.Combobox(settings_frame, textvariable=self.fps_var,
+                                      values=["10", "15", "30", "60", "Max"], width=6)
+        self.fps_combo.bind("<<ComboboxSelected>>", self.update_target_fps)
+        self.fps_combo.bind("<Return>", self.update_target_fps)
+        self.fps_combo.pack(anchor=tk.W, pady=2)
+        
         # Log frame
         log_frame = ttk.LabelFrame(main_frame, text="Activity Log", padding="5")
         log_frame.grid(row=2, column=0, columnspan=2, pady=(10, 0), sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -119,11 +159,22 @@ class BlinkDetectionGUI:
         self.log_message("GUI initialized successfully")
         
     def log_message(self, message):
-        """Add a message to the log"""
+        """Add a message to the log (safe to call from any thread)"""
         timestamp = time.strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\n"
-        self.log_text.insert(tk.END, log_entry)
-        self.log_text.see(tk.END)
+        self.log_queue.put(f"[{timestamp}] {message}\n")
+        
+    def _flush_log(self):
+        """Insert queued log messages into the log widget (Tk thread only)"""
+        added = False
+        while True:
+            try:
+                log_entry = self.log_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.log_text.insert(tk.END, log_entry)
+            added = True
+        if added:
+            self.log_text.see(tk.END)
         
     def toggle_detection(self):
         """Start or stop the detection"""
@@ -137,6 +188,7 @@ class BlinkDetectionGUI:
         try:
             self.camera.start()
             self.is_running = True
+            self.scheduler.reset()
             self.start_button.config(text="Stop Detection")
             self.status_label.config(text="Status: Running")
             self.log_message("Detection started")
@@ -153,6 +205,9 @@ class BlinkDetectionGUI:
         """Stop the detection process"""
         self.is_running = False
         self.camera.stop()
+        with self.display_lock:
+            self.pending_display = None
+        self.photo = None
         self.start_button.config(text="Start Detection")
         self.status_label.config(text="Status: Stopped")
         self.video_label.config(image="", text="Camera stopped")
@@ -162,46 +217,88 @@ class BlinkDetectionGUI:
         """Main detection loop running in separate thread"""
         while self.is_running:
             try:
-                frame = self.camera.read_frame()
+                self.scheduler.start_frame()
+                
+                with self.profiler.stage('capture'):
+                    frame = self.camera.read_frame()
                 if frame is None:
+                    self.profiler.discard_frame()
                     continue
                 
                 # Detect faces and eyes
                 faces, eyes, processed_frame = self.eye_tracker.detect_faces_and_eyes(frame)
                 
                 # Process blink detection
-                blink_detected = self.eye_tracker.process_blink_detection(eyes)
+                with self.profiler.stage('blink_logic'):
+                    blink_detected = self.eye_tracker.process_blink_detection(eyes)
                 
                 # Handle blink action
-                if blink_detected and self.sim_var.get():
+                if blink_detected and self.action_simulator.enabled:
                     success = self.action_simulator.press_enter()
                     if success:
                         stats = self.eye_tracker.get_stats()
                         self.log_message(f"Blink #{stats['total_blinks']} detected! Enter key pressed.")
                 
-                # Update GUI
-                self.update_gui(processed_frame, len(eyes))
+                # Hand the frame to the Tk thread
+                with self.profiler.stage('display'):
+                    self.update_gui(processed_frame, len(eyes))
+                self.profiler.end_frame()
                 
-                time.sleep(0.03)  # ~30 FPS
+                # Sleep only what is left of the frame period
+                self.scheduler.end_frame()
                 
             except Exception as e:
                 self.log_message(f"Detection error: {e}")
                 break
                 
     def update_gui(self, frame, eye_count):
-        """Update GUI elements with current data"""
-        # Update video display
+        """
+        Publish the latest frame for display (called from the detection thread)
+        
+        Only the newest frame is kept; frames produced faster than the display
+        refresh are overwritten without touching Tk.
+        """
         frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        frame_pil = Image.fromarray(frame_rgb)
-        frame_tk = ImageTk.PhotoImage(frame_pil)
+        with self.display_lock:
+            self.pending_display = (frame_rgb, eye_count)
         
-        self.video_label.config(image=frame_tk, text="")
-        self.video_label.image = frame_tk  # Keep a reference
+    def refresh_display(self):
+        """Show the newest frame and statistics (runs on the Tk main loop)"""
+        self._flush_log()
         
-        # Update statistics
-        stats = self.eye_tracker.get_stats()
-        self.blinks_label.config(text=f"Blinks: {stats['total_blinks']}")
-        self.eyes_label.config(text=f"Eyes detected: {eye_count}")
+        with self.display_lock:
+            pending = self.pending_display
+            self.pending_display = None
+        
+        if pending is not None and self.is_running:
+            frame_rgb, eye_count = pending
+            frame_pil = Image.fromarray(frame_rgb)
+            
+            # Reuse the PhotoImage unless the frame size changed
+            if self.photo is None or (self.photo.width(), self.photo.height()) != frame_pil.size:
+                self.photo = ImageTk.PhotoImage(frame_pil)
+                self.video_label.config(image=self.photo, text="")
+            else:
+                self.photo.paste(frame_pil)
+            
+            # Update statistics
+            stats = self.eye_tracker.get_stats()
+            self.blinks_label.config(text=f"Blinks: {stats['total_blinks']}")
+            self.eyes_label.config(text=f"Eyes detected: {eye_count}")
+            
+            # Update frame time twice a second to keep the label readable
+            now = time.perf_counter()
+            if now - self.last_latency_update >= 0.5:
+                self.last_latency_update = now
+                target = self.scheduler.target_fps
+                self.fps_label.config(
+                    text=f"FPS: {self.scheduler.fps:.1f} (target: {int(target) if target else 'max'})")
+                total = self.profiler.get_stats().get('total')
+                if total:
+                    self.latency_label.config(
+                        text=f"Frame time: {total['p50']:.1f} / {total['p95']:.1f} ms (p50/p95)")
+        
+        self.refresh_job = self.root.after(self.display_interval_ms, self.refresh_display)
         
     def toggle_simulation(self):
         """Toggle Enter key simulation"""
@@ -220,10 +317,26 @@ class BlinkDetectionGUI:
         self.eye_tracker.consecutive_frames = sensitivity
         self.log_message(f"Sensitivity updated to {sensitivity}")
         
+    def update_target_fps(self, event=None):
+        """Update the target detection rate ("Max" = as fast as possible)"""
+        value = self.fps_var.get().strip()
+        try:
+            target_fps = None if value.lower() == "max" else float(value)
+        except ValueError:
+            self.log_message(f"Invalid target FPS: {value}")
+            return
+        self.scheduler.set_target_fps(target_fps)
+        self.log_message(f"Target FPS set to {value}")
+        
     def on_closing(self):
         """Handle window closing"""
         if self.is_running:
             self.stop_detection()
+        if self.profiler.frames:
+            print("[INFO] Per-stage latency:")
+            self.profiler.print_summary()
+        if self.refresh_job is not None:
+            self.root.after_cancel(self.refresh_job)
         self.root.destroy()
 
 
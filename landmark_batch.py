@@ -0,0 +1,115 @@
+"""
+Landmark Batch Module
+Batched 68-point landmark prediction into one preallocated NumPy array
+
+Fitting landmarks one face at a time and converting each result with
+face_utils.shape_to_np creates a new array per face. LandmarkBatcher takes
+many (image, rect) pairs, whether several faces in one frame or faces from
+many frames in offline work. It writes every result straight into one reused
+(N, 68, 2) array, which can go directly to ear.eye_aspect_ratios(). Large
+batches are spread over a thread pool, so dlib's C++ prediction runs
+concurrently wherever it releases the GIL.
+
+A face whose prediction fails does not fail the batch: its row is zeroed
+and the error is kept in errors, so callers can skip just that face.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+NUM_LANDMARKS = 68
+
+
+class LandmarkBatcher:
+    def __init__(self, predictor, workers=None, min_parallel=4):
+        """
+        Initialize the landmark batcher
+
+        Args:
+            predictor: dlib.shape_predictor (e.g. from model_manager.get_shape_predictor)
+            workers (int): Thread pool size (default: number of CPUs)
+            min_parallel (int): Batches smaller than this run inline, where the
+                thread pool overhead would outweigh the gain (e.g. one live face)
+        """
+        self.predictor = predictor
+        self.workers = workers or os.cpu_count() or 1
+        self.min_parallel = min_parallel
+        self.executor = None
+
+        # Grows to the largest batch seen and is then reused
+        self.buffer = np.empty((0, NUM_LANDMARKS, 2), dtype=np.int32)
+
+        # Job index -> exception for every face that failed in the last batch
+        self.errors = {}
+
+    def _fill(self, out, index, image, rect):
+        """
+        Predict one face and write its points straight into out[index]
+
+        Returns:
+            The exception if prediction failed (the row is zeroed), otherwise None
+        """
+        row = out[index]
+        try:
+            shape = self.predictor(image, rect)
+            for j, p in enumerate(shape.parts()):
+                row[j, 0] = p.x
+                row[j, 1] = p.y
+        except Exception as e:
+            row[:] = 0
+            return e
+        return None
+
+    def predict_batch(self, jobs, copy=False):
+        """
+        Predict landmarks for many (image, rect) pairs
+
+        Args:
+            jobs (list): (image, dlib.rectangle) pairs; images may repeat
+            copy (bool): Return a new array instead of a view of the reused buffer
+
+        Returns:
+            numpy.ndarray: (N, 68, 2) int32 landmarks in job order. Without
+                copy, the view is only valid until the next call. Rows of
+                failed faces are zero; see errors.
+        """
+        count = len(jobs)
+        if count > len(self.buffer):
+            self.buffer = np.empty((count, NUM_LANDMARKS, 2), dtype=np.int32)
+        out = self.buffer[:count]
+
+        if count < self.min_parallel or self.workers == 1:
+            results = [self._fill(out, i, image, rect) for i, (image, rect) in enumerate(jobs)]
+        else:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                   thread_name_prefix="landmarks")
+            futures = [self.executor.submit(self._fill, out, i, image, rect)
+                       for i, (image, rect) in enumerate(jobs)]
+            results = [future.result() for future in futures]
+
+        self.errors = {i: error for i, error in enumerate(results) if error is not None}
+
+        return out.copy() if copy else out
+
+    def predict(self, image, rects, copy=False):
+        """
+        Predict landmarks for all faces in one image
+
+        Args:
+            image: Grayscale (or RGB) image
+            rects: dlib rectangles
+
+        Returns:
+            numpy.ndarray: (len(rects), 68, 2) int32 landmarks
+        """
+        return self.predict_batch([(image, rect) for rect in rects], copy=copy)
+
+    def close(self):
+        """Shut down the thread pool"""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
@@ -0,0 +1,157 @@
+"""
+Landmark Tracking Module
+Derives the next frame's face rectangles from the previous frame's landmarks
+
+Face detection (dlib HOG) is far more expensive than fitting 68 landmarks
+inside a known face box. Between detections, the bounding box of each face's
+previous landmarks is used as the next face rectangle. It is mapped back to
+the detector's rectangle geometry, measured on detection frames, because the
+predictor expects boxes shaped like the ones it was trained on. The full
+detector only runs periodically, when no face is tracked, or when the new
+landmarks look implausible (drift or collapse).
+"""
+
+
+class LandmarkFaceTracker:
+    def __init__(self, detector, margin=0.15, redetect_interval=30,
+                 max_drift=0.3, min_fill=0.5):
+        """
+        Initialize the landmark face tracker
+
+        Args:
+            detector: Full face detector, called as detector(gray, 0) and
+                returning dlib rectangles (e.g. dlib.get_frontal_face_detector())
+            margin (float): Margin added around the landmark bounding box, as a
+                fraction of its size, until the first detection frame has
+                measured the detector's rectangle geometry
+            redetect_interval (int): Run the full detector at least every N frames
+            max_drift (float): Re-detect when a face's landmark center moves or
+                its size changes by more than this fraction of its size between
+                consecutive frames
+            min_fill (float): Re-detect when the landmarks span less than this
+                fraction of the rectangle they were fitted in (poor fit)
+        """
+        import dlib
+
+        self.dlib = dlib
+        self.detector = detector
+        self.margin = margin
+        self.redetect_interval = redetect_interval
+        self.max_drift = max_drift
+        self.min_fill = min_fill
+
+        # Detector rectangle edges (left, top, right, bottom) relative to the
+        # landmark box, as fractions of its width/height
+        self.rect_geometry = (-margin, -margin, margin, margin)
+
+        self.tracked_rects = []
+        self.tracked_boxes = []
+        self.last_rects = []
+        self.frames_since_detection = 0
+        self.force_detection = True
+
+        # Statistics
+        self.frames = 0
+        self.detections = 0
+
+    def rects(self, gray):
+        """
+        Get the face rectangles for this frame
+
+        Args:
+            gray: Grayscale frame
+
+        Returns:
+            list: dlib rectangles to fit landmarks in
+        """
+        self.frames += 1
+        self.frames_since_detection += 1
+
+        if (self.force_detection or not self.tracked_rects or
+                self.frames_since_detection >= self.redetect_interval):
+            self.last_rects = list(self.detector(gray, 0))
+            self.frames_since_detection = 0
+            self.force_detection = False
+            self.detections += 1
+        else:
+            self.last_rects = self.tracked_rects
+
+        return self.last_rects
+
+    def update(self, shapes, frame_shape, indices=None):
+        """
+        Derive next frame's rectangles from this frame's landmarks
+
+        Args:
+            shapes (list): (68, 2) landmark arrays, one per rectangle returned by rects()
+            frame_shape (tuple): Frame (height, width) for clipping
+            indices (list): Position in rects() of each shape, when faces whose
+                landmarks failed were left out (default: all rectangles, in order)
+        """
+        height, width = frame_shape[:2]
+
+        if indices is None:
+            indices = range(len(self.last_rects))
+        elif len(indices) < len(self.last_rects):
+            # A face without landmarks can only be found again by the detector
+            self.force_detection = True
+
+        boxes = []
+        samples = []
+        detected = self.frames_since_detection == 0
+        # Drift is only measured between two landmark fits of the same face,
+        # i.e. when this frame used tracked rectangles
+        previous = [] if detected else self.tracked_boxes
+
+        for i, shape in zip(indices, shapes):
+            rect = self.last_rects[i]
+            x0, y0 = shape.min(axis=0)
+            x1, y1 = shape.max(axis=0)
+            w = max(1, x1 - x0)
+            h = max(1, y1 - y0)
+
+            # Landmarks collapsed inside the rectangle - the fit is not trustworthy
+            if w < self.min_fill * rect.width() or h < self.min_fill * rect.height():
+                self.force_detection = True
+                return
+
+            # Large jump in position or size since the previous frame
+            if i < len(previous):
+                px0, py0, px1, py1 = previous[i]
+                pw = max(1, px1 - px0)
+                ph = max(1, py1 - py0)
+                drift = max(abs((x0 + x1) - (px0 + px1)) / (2.0 * pw),
+                            abs((y0 + y1) - (py0 + py1)) / (2.0 * ph),
+                            abs(w - pw) / float(pw))
+                if drift > self.max_drift:
+                    self.force_detection = True
+                    return
+
+            # On detection frames, measure where the detector's rectangle lies
+            # relative to the landmark box
+            if detected:
+                samples.append(((rect.left() - x0) / float(w), (rect.top() - y0) / float(h),
+                                (rect.right() - x1) / float(w), (rect.bottom() - y1) / float(h)))
+            boxes.append((x0, y0, x1, y1))
+
+        if samples:
+            self.rect_geometry = tuple(sum(side) / len(samples) for side in zip(*samples))
+
+        # Map each landmark box back to the detector's rectangle geometry, so
+        # tracked frames fit landmarks in the same kind of box as detection
+        # frames (and the box cannot grow from frame to frame)
+        left, top, right, bottom = self.rect_geometry
+        tracked = []
+        for x0, y0, x1, y1 in boxes:
+            w = max(1, x1 - x0)
+            h = max(1, y1 - y0)
+            tracked.append(self.dlib.rectangle(
+                int(max(0, x0 + left * w)), int(max(0, y0 + top * h)),
+                int(min(width - 1, x1 + right * w)), int(min(height - 1, y1 + bottom * h))))
+
+        self.tracked_rects = tracked
+        self.tracked_boxes = boxes
+
+    def detection_ratio(self):
+        """Fraction of frames on which the full detector ran"""
+        return self.detections / self.frames if self.frames else 0.0
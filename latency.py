@@ -0,0 +1,159 @@
+"""
+Latency Instrumentation Module
+Records per-stage frame timings and rolling percentiles for the detection loop
+"""
+
+import collections
+import json
+import time
+
+
+# Pipeline stages in display order
+STAGES = ['capture', 'grayscale', 'face_detection', 'eye_detection', 'blink_logic', 'drawing', 'display']
+
+
+class _StageTimer:
+    """Context manager that records one stage duration on exit"""
+
+    __slots__ = ('profiler', 'stage', 'start')
+
+    def __init__(self, profiler, stage):
+        self.profiler = profiler
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.add(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    """No-op stage timer used when profiling is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class NullProfiler:
+    """Profiler stand-in that records nothing"""
+
+    enabled = False
+
+    def stage(self, name):
+        return NULL_TIMER
+
+    def add(self, name, duration):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def discard_frame(self):
+        pass
+
+
+class LatencyProfiler:
+    enabled = True
+
+    def __init__(self, window=300):
+        """
+        Initialize the latency profiler
+
+        Args:
+            window (int): Number of most recent frames kept per stage for percentiles
+        """
+        self.window = window
+        self.samples = {}
+        self.frame_totals = collections.deque(maxlen=window)
+        self.current_frame_total = 0.0
+        self.frames = 0
+
+    def stage(self, name):
+        """
+        Time a pipeline stage
+
+        Usage:
+            with profiler.stage('face_detection'):
+                faces = cascade.detectMultiScale(gray)
+        """
+        return _StageTimer(self, name)
+
+    def add(self, name, duration):
+        """Record a stage duration in seconds"""
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = collections.deque(maxlen=self.window)
+        samples.append(duration)
+        self.current_frame_total += duration
+
+    def end_frame(self):
+        """Mark the end of a frame, recording the summed stage time"""
+        self.frame_totals.append(self.current_frame_total)
+        self.current_frame_total = 0.0
+        self.frames += 1
+
+    def discard_frame(self):
+        """Drop the stage time summed so far, e.g. when no frame was captured"""
+        self.current_frame_total = 0.0
+
+    @staticmethod
+    def _percentiles(samples):
+        """p50/p95/p99 in milliseconds using nearest-rank on the rolling window"""
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+        return {
+            'p50': ordered[int(last * 0.50)] * 1000.0,
+            'p95': ordered[int(last * 0.95)] * 1000.0,
+            'p99': ordered[int(last * 0.99)] * 1000.0
+        }
+
+    def get_stats(self):
+        """
+        Get rolling latency percentiles per stage
+
+        Returns:
+            dict: Stage name -> {'p50', 'p95', 'p99'} in milliseconds,
+                plus 'total' for the whole frame
+        """
+        names = [s for s in STAGES if s in self.samples]
+        names += [s for s in self.samples if s not in STAGES]
+
+        stats = {name: self._percentiles(self.samples[name])
+                 for name in names if self.samples[name]}
+        if self.frame_totals:
+            stats['total'] = self._percentiles(self.frame_totals)
+        return stats
+
+    def overlay_info(self):
+        """
+        Format p50/p95 per stage for EyeTracker.draw_stats additional_info
+
+        Returns:
+            dict: Stage name -> "p50/p95 ms" string
+        """
+        return {name: f"{p['p50']:.1f}/{p['p95']:.1f} ms"
+                for name, p in self.get_stats().items()}
+
+    def dump(self, path):
+        """Write the current percentiles to a JSON file"""
+        with open(path, 'w') as f:
+            json.dump({'frames': self.frames, 'window': self.window,
+                       'stages_ms': self.get_stats()}, f, indent=2)
+
+    def print_summary(self):
+        """Print a percentile table to the console"""
+        print(f"  {'stage':<16}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for name, p in self.get_stats().items():
+            print(f"  {name:<16}{p['p50']:>9.2f}{p['p95']:>9.2f}{p['p99']:>9.2f}")
@@ -2,12 +2,60 @@
 Main application for Eye Blink Detection System
 """
 
+from startup import BackgroundLoader, StartupTimer
+
+# Started before the remaining imports so they show up in the startup breakdown
+startup = StartupTimer()
+
+import argparse
+
+from capture import ThreadedCapture
+from event_server import EventServer
 from eye_tracker import EyeTracker
+from face_tracks import MultiFaceTracker
+from frame_buffers import AllocationMonitor
+from latency import LatencyProfiler, NullProfiler
+from replay import ReplaySource
+from session_log import SessionRecorder
 from utils import CameraManager, ActionSimulator, DisplayManager, print_instructions, handle_key_press
 
+startup.mark('imports')
+
+
+def parse_args():
+    """Parse command-line options"""
+    ap = argparse.ArgumentParser(description="Eye Blink Detection System")
+    ap.add_argument("--width", type=int, default=600,
+                    help="display/processing frame width")
+    ap.add_argument("--detection-scale", type=float, default=1.0,
+                    help="run face detection at this fraction of the frame size (e.g. 0.5)")
+    ap.add_argument("--backend", choices=['haar', 'landmark'], default='haar',
+                    help="eye analysis: Haar eye count or dlib landmark EAR")
+    ap.add_argument("--profile", action="store_true",
+                    help="record per-stage latency and overlay p50/p95 on the frame")
+    ap.add_argument("--profile-output", default=None,
+                    help="write latency percentiles to this JSON file at shutdown")
+    ap.add_argument("--track-allocations", action="store_true",
+                    help="measure memory allocated per frame with tracemalloc (slow)")
+    ap.add_argument("--record", default=None, metavar="PATH",
+                    help="append per-frame results to a binary session file "
+                         "(summarize with: python session_log.py PATH)")
+    ap.add_argument("--multi-face", action="store_true",
+                    help="give each face a stable ID and count its blinks separately")
+    ap.add_argument("--serve", default=None, metavar="HOST:PORT",
+                    help="stream blink events and metrics as JSON lines to local clients "
+                         "(e.g. 127.0.0.1:8765, or unix:/path/to/socket)")
+    ap.add_argument("--replay", default=None, metavar="PATH",
+                    help="run on a recorded video, image directory or glob pattern "
+                         "instead of the camera (every frame, original timestamps)")
+    ap.add_argument("--realtime", action="store_true",
+                    help="with --replay, pace frames to the original timing")
+    return ap.parse_args()
+
 
 def main():
     """Main application function"""
+    args = parse_args()
     
     # Print instructions
     print_instructions()
@@ -16,22 +64,53 @@ def main():
     try:
         print("[INFO] Initializing components...")
         
+        # Initialize latency profiler
+        profiler = LatencyProfiler() if args.profile or args.profile_output else NullProfiler()
+        allocation_monitor = AllocationMonitor() if args.track_allocations else None
+        
+        # Session recorder (written by a background thread)
+        recorder = SessionRecorder(args.record) if args.record else None
+        
+        # Event streaming server
+        server = None
+        if args.serve:
+            if args.serve.startswith("unix:"):
+                server = EventServer(unix_path=args.serve[len("unix:"):]).start()
+            else:
+                host, _, port = args.serve.rpartition(":")
+                server = EventServer(host=host or "127.0.0.1", port=int(port)).start()
+            print(f"[INFO] Streaming events on {server.address}")
+        
         # Initialize eye tracker
         eye_tracker = EyeTracker(
-            blink_threshold=0.5,
-            consecutive_frames=3
+            consecutive_frames=3,
+            backend=args.backend,
+            profiler=profiler,
+            detection_scale=args.detection_scale
         )
         
-        # Initialize camera manager
-        camera = CameraManager(src=0, width=600)
+        # Per-person blink tracking
+        face_tracks = MultiFaceTracker.for_eye_tracker(eye_tracker) if args.multi_face else None
+        
+        # Load the models in the background while the camera starts
+        model_loader = BackgroundLoader(eye_tracker.preload, name="cascade-loader")
+        
+        # Initialize camera manager, reading frames in a background thread.
+        # A replay is read synchronously so no frame is ever dropped.
+        if args.replay:
+            camera = ReplaySource(args.replay, width=args.width, realtime=args.realtime)
+        else:
+            camera = ThreadedCapture(CameraManager(src=0, width=args.width))
         
         # Initialize action simulator
-        action_simulator = ActionSimulator(enabled=True)
+        # (off during replays; toggle with 's')
+        action_simulator = ActionSimulator(enabled=not args.replay)
         
         # Initialize display manager
         display = DisplayManager("Eye Blink Detection System")
         
         print("[INFO] All components initialized successfully!")
+        startup.mark('components')
         
     except Exception as e:
         print(f"[ERROR] Failed to initialize components: {e}")
@@ -40,6 +119,7 @@ def main():
     # Start camera
     try:
         camera.start()
+        startup.mark('camera_start')
     except Exception as e:
         print(f"[ERROR] Camera initialization failed: {e}")
         print("Please check:")
@@ -52,40 +132,86 @@ def main():
     print("[INFO] Press 'q' to quit, 's' to toggle simulation, 'r' to reset counter")
     
     # Main detection loop
+    first_frame = True
+    blink_frames = []
     try:
         while True:
             # Read frame from camera
-            frame = camera.read_frame()
+            with profiler.stage('capture'):
+                frame = camera.read_frame()
             
             if frame is None:
+                # Don't carry the capture time into the next frame's total
+                profiler.discard_frame()
+                if args.replay and camera.finished:
+                    print("[INFO] End of replay")
+                    break
                 print("[WARNING] No frame captured from camera")
                 continue
             
+            # Replays use the recorded timeline, live capture the wall clock
+            timestamp = camera.timestamp if args.replay else None
+            
+            if allocation_monitor is not None:
+                allocation_monitor.start_frame()
+            
             # Detect faces and eyes
             faces, eyes, processed_frame = eye_tracker.detect_faces_and_eyes(frame)
             
             # Process blink detection
-            blink_detected = eye_tracker.process_blink_detection(eyes)
+            with profiler.stage('blink_logic'):
+                blink_detected = eye_tracker.process_blink_detection(eyes, timestamp)
+            
+            if face_tracks is not None:
+                person_events = face_tracks.update(faces, eye_tracker.last_face_eyes,
+                                                   eye_tracker.last_face_ears, timestamp)
+                for face_id, event in person_events:
+                    print(f"[INFO] Person {face_id}: blink #{event.count} ({event.duration_ms:.0f} ms)")
+            
+            if recorder is not None:
+                recorder.record_tracker(eye_tracker, faces, eyes, blink_detected, timestamp)
+            if server is not None:
+                server.publish_frame(eye_tracker, faces, eyes, blink_detected, timestamp)
             
             # Handle blink action
             if blink_detected:
+                if args.replay:
+                    blink_frames.append(camera.frame_index - 1)
                 success = action_simulator.press_enter()
                 if success:
                     stats = eye_tracker.get_stats()
                     print(f"[ACTION] Blink #{stats['total_blinks']} detected! Enter key pressed.")
             
             # Draw statistics and info
-            additional_info = {
-                "Enter Sim": "ON" if action_simulator.enabled else "OFF",
-                "Faces": len(faces)
-            }
-            processed_frame = eye_tracker.draw_stats(processed_frame, additional_info)
+            with profiler.stage('drawing'):
+                additional_info = {
+                    "Enter Sim": "ON" if action_simulator.enabled else "OFF",
+                    "Faces": len(faces),
+                    "Dropped": camera.frames_dropped
+                }
+                if profiler.enabled:
+                    additional_info.update(profiler.overlay_info())
+                processed_frame = eye_tracker.draw_stats(processed_frame, additional_info)
+                if face_tracks is not None:
+                    face_tracks.draw(processed_frame)
+            
+            if allocation_monitor is not None:
+                allocation_monitor.end_frame()
             
-            # Display frame
-            display.show_frame(processed_frame)
+            # Display frame and poll keys
+            with profiler.stage('display'):
+                display.show_frame(processed_frame)
+                key = display.wait_key(1)
+            profiler.end_frame()
+            
+            if first_frame:
+                first_frame = False
+                startup.mark('first_frame')
+                model_loader.result()
+                print(f"[INFO] Models loaded in background in {model_loader.duration * 1000:.0f} ms")
+                startup.print_report("Time to first frame")
             
             # Handle key presses
-            key = display.wait_key(1)
             if not handle_key_press(key, eye_tracker, action_simulator):
                 break
                 
@@ -99,11 +225,31 @@ def main():
         print("[INFO] Cleaning up...")
         camera.stop()
         display.cleanup()
+        if server is not None:
+            server.stop()
+        if recorder is not None:
+            recorder.close()
+            print(f"[INFO] {recorder.records_written} frames recorded to {args.record}")
         
         # Print final statistics
         stats = eye_tracker.get_stats()
         print(f"\n[INFO] Session Summary:")
         print(f"  Total blinks detected: {stats['total_blinks']}")
+        print(f"  Frames dropped by capture: {camera.frames_dropped}")
+        if args.replay:
+            # Identical across runs of the same recording and settings
+            print(f"  Replayed frames: {camera.frame_index}")
+            print(f"  Blink frames: {blink_frames}")
+        
+        if profiler.enabled:
+            print(f"\n[INFO] Per-stage latency:")
+            profiler.print_summary()
+            if args.profile_output:
+                profiler.dump(args.profile_output)
+                print(f"[INFO] Latency report written to {args.profile_output}")
+        if allocation_monitor is not None:
+            alloc = allocation_monitor.get_stats()
+            print(f"  Allocated per frame: mean {alloc.get('mean_kb')} KB, max {alloc.get('max_kb')} KB")
         print(f"  Thank you for using Eye Blink Detection System!")
 
 
@@ -0,0 +1,154 @@
+"""
+Model Manager Module
+Loads Haar cascades and dlib shape predictors once per process and shares them
+
+Every EyeTracker and script asks this module for its models instead of
+deserializing them itself, so several trackers in one process share a single
+copy. Worker processes started with the 'fork' method inherit models that the
+parent preloaded, and the pages stay shared copy-on-write instead of each
+worker paying for its own ~100 MB landmark predictor.
+
+A shared cascade must only be used by one thread at a time:
+detectMultiScale() changes the classifier's internal state, so two threads
+detecting with the same instance at once race. Models may be loaded on one
+thread (e.g. a background preload) and used on another. Concurrent
+detection threads in one process should create their own
+cv2.CascadeClassifier instead.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import cv2
+
+
+FACE_CASCADE = 'haarcascade_frontalface_default.xml'
+EYE_CASCADE = 'haarcascade_eye.xml'
+SHAPE_PREDICTOR_PATH = "shape_predictor_68_face_landmarks.dat"
+
+_models = {}
+_metrics = {}
+_lock = threading.Lock()
+
+
+def _current_rss_mb():
+    """Current resident set size in MB (None where unsupported)"""
+    if sys.platform.startswith('linux'):
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024.0 * 1024.0)
+    return None
+
+
+def _get(key, loader, source_path):
+    """Return a cached model, loading it (once) with the given loader"""
+    model = _models.get(key)
+    if model is not None:
+        _metrics[key]['hits'] += 1
+        return model
+
+    with _lock:
+        # Another thread may have finished loading while we waited
+        model = _models.get(key)
+        if model is not None:
+            _metrics[key]['hits'] += 1
+            return model
+
+        rss_before = _current_rss_mb()
+        start = time.perf_counter()
+        model = loader()
+        load_time = time.perf_counter() - start
+        rss_after = _current_rss_mb()
+
+        _metrics[key] = {
+            'load_s': round(load_time, 4),
+            'file_mb': round(os.path.getsize(source_path) / (1024.0 * 1024.0), 1)
+            if os.path.exists(source_path) else None,
+            'rss_delta_mb': round(rss_after - rss_before, 1)
+            if rss_before is not None else None,
+            'pid': os.getpid(),
+            'hits': 0
+        }
+        _models[key] = model
+        return model
+
+
+def get_cascade(name):
+    """
+    Get a shared OpenCV Haar cascade
+
+    The instance is shared by every caller in the process; do not run
+    detectMultiScale() on it from two threads at once.
+
+    Args:
+        name (str): Cascade file name from cv2.data.haarcascades (e.g. FACE_CASCADE)
+
+    Returns:
+        cv2.CascadeClassifier
+    """
+    path = cv2.data.haarcascades + name
+
+    def load():
+        cascade = cv2.CascadeClassifier(path)
+        if cascade.empty():
+            raise IOError(f"Failed to load Haar cascade: {path}")
+        return cascade
+
+    return _get(('cascade', name), load, path)
+
+
+def get_shape_predictor(path=SHAPE_PREDICTOR_PATH):
+    """
+    Get a shared dlib facial landmark predictor
+
+    Args:
+        path (str): Path to the .dat model file
+
+    Returns:
+        dlib.shape_predictor
+    """
+    def load():
+        import dlib
+        if not os.path.exists(path):
+            raise IOError(f"Shape predictor file not found: {path}")
+        return dlib.shape_predictor(path)
+
+    return _get(('shape_predictor', os.path.abspath(path)), load, path)
+
+
+def preload(cascades=True, shape_predictor=None):
+    """
+    Load models up front, e.g. in a parent process before forking workers
+
+    Args:
+        cascades (bool): Load the face and eye Haar cascades
+        shape_predictor (str): Path of a landmark predictor to load (None = skip)
+    """
+    if cascades:
+        get_cascade(FACE_CASCADE)
+        get_cascade(EYE_CASCADE)
+    if shape_predictor:
+        get_shape_predictor(shape_predictor)
+
+
+def get_metrics():
+    """
+    Get load-time and memory metrics for every loaded model
+
+    Returns:
+        dict: Model name -> {'load_s', 'file_mb', 'rss_delta_mb', 'pid', 'hits'}.
+            'pid' is the process that loaded the model; in forked workers it is
+            the parent's, showing the model was inherited rather than reloaded.
+    """
+    return {f"{kind}:{os.path.basename(name)}": dict(metrics)
+            for (kind, name), metrics in _metrics.items()}
+
+
+def print_metrics():
+    """Print model metrics to the console"""
+    print("[INFO] Loaded models:")
+    for name, m in get_metrics().items():
+        print(f"  {name:<50} load {m['load_s'] * 1000:>8.1f} ms, "
+              f"file {m['file_mb']} MB, RSS +{m['rss_delta_mb']} MB, reused {m['hits']}x")
@@ -0,0 +1,237 @@
+"""
+Multi-Camera Supervisor
+Runs blink detection for several cameras or video files in a process pool
+
+Each worker process creates its EyeTracker once and then processes whole
+streams, so per-stream blink state never mixes and detection
+is not limited by a single interpreter's GIL. Blink events from all streams
+are aggregated into one queue and reported by the supervisor.
+
+With the 'fork' start method the supervisor preloads the models (including
+the landmark predictor for the 'landmark' backend) before starting the pool,
+so workers share them copy-on-write instead of each loading its own copy.
+Each stream summary reports whether the worker's models were inherited.
+
+Usage:
+    python multi_camera.py 0 1 2
+    python multi_camera.py booth1.mp4 booth2.mp4 --output events.jsonl
+    python multi_camera.py 0 1 --backend landmark
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import time
+
+import cv2
+
+import model_manager
+from batch_processor import process_video
+from eye_tracker import EyeTracker
+
+
+# Per-worker state, created once by _init_worker
+_eye_tracker = None
+_event_queue = None
+_stop_event = None
+
+
+def _init_worker(event_queue, stop_event, tracker_kwargs):
+    """Load the EyeTracker once per worker process"""
+    global _eye_tracker, _event_queue, _stop_event
+
+    # Ctrl+C is handled by the supervisor, which asks workers to stop via stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # One stream per process - avoid OpenCV's internal threads oversubscribing cores
+    cv2.setNumThreads(1)
+
+    _eye_tracker = EyeTracker(**tracker_kwargs).preload()
+    _event_queue = event_queue
+    _stop_event = stop_event
+
+
+def parse_source(source):
+    """Camera indices are given as integers, anything else is a file path"""
+    return int(source) if source.isdigit() else source
+
+
+def run_stream(task):
+    """
+    Process one stream to completion inside a worker
+
+    Args:
+        task (tuple): (stream_id, source, width)
+
+    Returns:
+        dict: Stream summary (frames, blinks, elapsed seconds, fps, and whether
+            the worker's models were inherited from the supervisor)
+    """
+    stream_id, source, width = task
+    frames = 0
+    error = None
+    start = time.perf_counter()
+
+    # The worker's tracker is reused across tasks; never report the previous
+    # stream's counts, even if this source fails to open
+    _eye_tracker.reset_counters()
+    _eye_tracker.reset_tracking()
+
+    try:
+        for record in process_video(source, _eye_tracker, width=width):
+            frames += 1
+
+            if record['blink']:
+                _event_queue.put({
+                    'stream': stream_id,
+                    'source': record['video'],
+                    'frame': record['frame'],
+                    'timestamp_ms': record['timestamp_ms'],
+                    'total_blinks': record['total_blinks'],
+                    'time': time.time()
+                })
+
+            if _stop_event.is_set():
+                break
+    except IOError as e:
+        error = str(e)
+        print(f"[ERROR] Stream {stream_id}: {e}")
+
+    elapsed = time.perf_counter() - start
+
+    # Models loaded in this worker carry its own pid; inherited ones the supervisor's
+    model_pids = [metrics['pid'] for metrics in model_manager.get_metrics().values()]
+
+    summary = {
+        'stream': stream_id,
+        'source': str(source),
+        'frames': frames,
+        'blinks': _eye_tracker.total_blinks,
+        'elapsed_s': round(elapsed, 3),
+        'fps': round(frames / elapsed, 1) if elapsed > 0 else 0.0,
+        'pid': os.getpid(),
+        'models_inherited': bool(model_pids) and os.getpid() not in model_pids
+    }
+    if error is not None:
+        summary['error'] = error
+    return summary
+
+
+class MultiCameraSupervisor:
+    def __init__(self, sources, processes=None, width=600, consecutive_frames=3, backend='haar'):
+        """
+        Initialize the supervisor
+
+        Args:
+            sources (list): Camera indices and/or video file paths
+            processes (int): Worker processes (default: one per source).
+                Live cameras need one worker each, since a worker keeps a
+                stream until it ends.
+            width (int): Processing frame width
+            consecutive_frames (int): Frames needed to confirm a blink
+            backend (str): Eye analysis backend, 'haar' or 'landmark'
+        """
+        self.sources = list(sources)
+        self.processes = processes or len(self.sources)
+        self.width = width
+        self.tracker_kwargs = {'consecutive_frames': consecutive_frames, 'backend': backend}
+
+        self.event_queue = multiprocessing.Queue()
+        self.stop_event = multiprocessing.Event()
+
+    def stop(self):
+        """Ask all workers to finish their current stream"""
+        self.stop_event.set()
+
+    def run(self, on_event=None):
+        """
+        Run all streams and aggregate their blink events
+
+        Args:
+            on_event (callable): Called with each blink event dict, in arrival order
+
+        Returns:
+            list: Per-stream summaries
+        """
+        tasks = [(i, source, self.width) for i, source in enumerate(self.sources)]
+
+        # Forked workers inherit models loaded here; spawned workers load their own
+        if multiprocessing.get_start_method() == 'fork':
+            landmark = self.tracker_kwargs['backend'] == 'landmark'
+            model_manager.preload(shape_predictor=model_manager.SHAPE_PREDICTOR_PATH if landmark else None)
+
+        with multiprocessing.Pool(self.processes, initializer=_init_worker,
+                                  initargs=(self.event_queue, self.stop_event,
+                                            self.tracker_kwargs)) as pool:
+            result = pool.map_async(run_stream, tasks)
+
+            try:
+                while not result.ready():
+                    self._drain_events(on_event, timeout=0.1)
+            except KeyboardInterrupt:
+                print("\n[INFO] Interrupted by user, stopping streams...")
+                self.stop()
+
+            summaries = result.get()
+
+        # Pick up events that arrived after the last poll
+        self._drain_events(on_event)
+        return summaries
+
+    def _drain_events(self, on_event, timeout=None):
+        """Forward queued events to the callback"""
+        while True:
+            try:
+                event = self.event_queue.get(timeout=timeout)
+            except queue.Empty:
+                return
+            timeout = None
+            if on_event:
+                on_event(event)
+
+
+def main():
+    """Command-line entry point"""
+    ap = argparse.ArgumentParser(description="Blink detection across multiple cameras/videos")
+    ap.add_argument("sources", nargs="+", help="camera indices and/or video files")
+    ap.add_argument("-p", "--processes", type=int, default=None,
+                    help="worker processes (default: one per source)")
+    ap.add_argument("-o", "--output", default=None,
+                    help="append blink events to this JSONL file")
+    ap.add_argument("-w", "--width", type=int, default=600,
+                    help="processing frame width")
+    ap.add_argument("--backend", choices=['haar', 'landmark'], default='haar',
+                    help="eye analysis: Haar eye count or dlib landmark EAR")
+    args = ap.parse_args()
+
+    supervisor = MultiCameraSupervisor([parse_source(s) for s in args.sources],
+                                       processes=args.processes, width=args.width,
+                                       backend=args.backend)
+    output = open(args.output, 'a') if args.output else None
+
+    def on_event(event):
+        print(f"[ACTION] Stream {event['stream']} ({event['source']}): "
+              f"blink #{event['total_blinks']} at frame {event['frame']}")
+        if output:
+            output.write(json.dumps(event) + '\n')
+
+    try:
+        summaries = supervisor.run(on_event)
+    finally:
+        if output:
+            output.close()
+
+    print(f"\n[INFO] Session Summary:")
+    for summary in summaries:
+        print(f"  Stream {summary['stream']} ({summary['source']}): {summary['frames']} frames, "
+              f"{summary['blinks']} blinks, {summary['fps']} fps, "
+              f"models {'inherited' if summary['models_inherited'] else 'loaded in worker'}")
+        if 'error' in summary:
+            print(f"    failed: {summary['error']}")
+
+
+if __name__ == "__main__":
+    main()
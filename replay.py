@@ -0,0 +1,123 @@
+"""
+Replay Module
+Feeds a recorded video or image sequence through the detection pipeline like a camera
+
+ReplaySource has the same start()/stop()/read_frame() interface as
+CameraManager, so main.py can run the exact live pipeline on a recording.
+Every frame is delivered exactly once, in order, together with its original
+timestamp, so blink events are identical from run to run. Frames are
+delivered as fast as they can be processed, or paced to the original timing.
+"""
+
+import glob
+import os
+import time
+
+import cv2
+
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+
+class ReplaySource:
+    def __init__(self, path, width=600, realtime=False, fps=30.0):
+        """
+        Initialize the replay source
+
+        Args:
+            path (str): Video file, directory of images, or glob pattern
+                (e.g. 'frames/*.png'); images are replayed in sorted order
+            width (int): Output frame width, matching CameraManager's resize
+            realtime (bool): Pace frames to their original timestamps instead
+                of delivering them as fast as possible
+            fps (float): Frame rate assumed for image sequences (and videos
+                without timestamps)
+        """
+        self.path = path
+        self.width = width
+        self.realtime = realtime
+        self.fps = fps
+
+        self.capture = None
+        self.images = None
+        self.start_time = None
+
+        # Timestamp (seconds) of the frame last returned by read_frame()
+        self.timestamp = None
+        self.frame_index = 0
+        self.finished = False
+
+        # Same statistic as ThreadedCapture; replay never drops frames
+        self.frames_dropped = 0
+
+    def start(self):
+        """Open the recording"""
+        if os.path.isdir(self.path):
+            self.images = sorted(os.path.join(self.path, name) for name in os.listdir(self.path)
+                                 if name.lower().endswith(IMAGE_EXTENSIONS))
+        elif any(c in self.path for c in '*?['):
+            self.images = sorted(glob.glob(self.path))
+        else:
+            self.capture = cv2.VideoCapture(self.path)
+            if not self.capture.isOpened():
+                raise IOError(f"Cannot open recording: {self.path}")
+
+        if self.images is not None and not self.images:
+            raise IOError(f"No images found: {self.path}")
+
+        self.frame_index = 0
+        self.finished = False
+        self.start_time = time.perf_counter()
+        return self
+
+    def stop(self):
+        """Close the recording"""
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+
+    def read_frame(self):
+        """
+        Read the next recorded frame
+
+        Returns:
+            Resized frame, or None once the recording is exhausted
+            (finished is then True)
+        """
+        frame, timestamp = self._next()
+        if frame is None:
+            self.finished = True
+            return None
+
+        if self.realtime:
+            delay = self.start_time + timestamp - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        self.timestamp = timestamp
+        self.frame_index += 1
+
+        h, w = frame.shape[:2]
+        if w != self.width:
+            frame = cv2.resize(frame, (self.width, int(h * (self.width / float(w)))),
+                               interpolation=cv2.INTER_AREA)
+        return frame
+
+    def _next(self):
+        """Decode the next frame and its original timestamp in seconds"""
+        if self.images is not None:
+            if self.frame_index >= len(self.images):
+                return None, None
+            frame = cv2.imread(self.images[self.frame_index])
+            if frame is None:
+                raise IOError(f"Cannot read image: {self.images[self.frame_index]}")
+            return frame, self.frame_index / self.fps
+
+        grabbed, frame = self.capture.read()
+        if not grabbed:
+            return None, None
+        timestamp_ms = self.capture.get(cv2.CAP_PROP_POS_MSEC)
+        if timestamp_ms <= 0 and self.frame_index > 0:
+            # Container without timestamps
+            return frame, self.frame_index / self.fps
+        return frame, timestamp_ms / 1000.0
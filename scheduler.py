@@ -0,0 +1,97 @@
+"""
+Frame Scheduler Module
+Paces a processing loop to a target frame rate and measures the achieved rate
+"""
+
+import threading
+import time
+
+
+class FrameScheduler:
+    def __init__(self, target_fps=30.0, smoothing=0.9):
+        """
+        Initialize the frame scheduler
+
+        Args:
+            target_fps (float): Target frames per second; None or 0 runs as fast as possible
+            smoothing (float): Exponential smoothing factor for the reported fps (0-1)
+        """
+        self.smoothing = smoothing
+
+        # The rate may be changed from another thread (e.g. the GUI) while a
+        # frame is being processed; the new period is picked up by end_frame()
+        self.lock = threading.Lock()
+        self.rate_changed = False
+        self.set_target_fps(target_fps)
+
+        self.last_frame_time = None
+        self.next_deadline = None
+        self.fps = 0.0
+        self.last_processing_time = 0.0
+
+    def set_target_fps(self, target_fps):
+        """Change the target rate; None or 0 disables pacing (safe from any thread)"""
+        with self.lock:
+            self.target_fps = target_fps if target_fps else None
+            self.frame_period = 1.0 / self.target_fps if self.target_fps else 0.0
+            self.rate_changed = True
+
+    def start_frame(self):
+        """Mark the start of frame processing"""
+        now = time.perf_counter()
+
+        # Achieved fps from the interval between frame starts
+        if self.last_frame_time is not None:
+            interval = now - self.last_frame_time
+            if interval > 0:
+                instant_fps = 1.0 / interval
+                if self.fps == 0.0:
+                    self.fps = instant_fps
+                else:
+                    self.fps = self.smoothing * self.fps + (1.0 - self.smoothing) * instant_fps
+        self.last_frame_time = now
+
+        if self.next_deadline is None:
+            self.next_deadline = now
+
+    def end_frame(self):
+        """
+        Mark the end of frame processing and sleep only the rest of the frame period
+
+        Returns:
+            float: Seconds slept
+        """
+        now = time.perf_counter()
+        self.last_processing_time = now - self.last_frame_time if self.last_frame_time else 0.0
+
+        with self.lock:
+            frame_period = self.frame_period
+            if self.rate_changed:
+                # Restart the schedule at the new rate
+                self.rate_changed = False
+                self.next_deadline = None
+
+        if not frame_period:
+            return 0.0
+
+        if self.next_deadline is None:
+            self.next_deadline = now
+            return 0.0
+
+        self.next_deadline += frame_period
+        remaining = self.next_deadline - now
+
+        if remaining <= 0:
+            # Running behind - don't try to catch up with a burst of frames
+            self.next_deadline = now
+            return 0.0
+
+        time.sleep(remaining)
+        return remaining
+
+    def reset(self):
+        """Forget timing history, e.g. when detection restarts"""
+        self.last_frame_time = None
+        self.next_deadline = None
+        self.fps = 0.0
+        self.last_processing_time = 0.0
@@ -0,0 +1,279 @@
+"""
+Service Module
+Headless blink detection for server deployments
+
+Runs the EyeTracker pipeline without any window, drawing or keyboard
+simulation: no cv2.imshow, no rectangles or text rendered on frames, and no
+Tk, PIL, pyautogui or utils imports. Blink events go to a JSON-lines file,
+the event stream (--serve) and/or a session recording (--record).
+
+The service is controlled with signals:
+    SIGTERM / SIGINT   stop cleanly
+    SIGUSR1            reset the blink counters
+    SIGHUP             print statistics
+
+or, with --control PATH, by sending one command per line ("stats", "reset",
+"stop") to a Unix socket; "stats" replies with a JSON line.
+
+Usage:
+    python service.py --source 0 --events blinks.jsonl --serve 127.0.0.1:8765
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import threading
+import time
+
+from action_dispatcher import ActionDispatcher, FileSink
+from capture import OpenCVCamera, ThreadedCapture
+from event_server import EventServer
+from eye_tracker import EyeTracker
+from replay import ReplaySource
+from session_log import SessionRecorder
+
+
+class BlinkService:
+    def __init__(self, eye_tracker, camera, dispatcher=None, server=None, recorder=None,
+                 control_path=None):
+        """
+        Initialize the headless service
+
+        Args:
+            eye_tracker (EyeTracker): Detection pipeline
+            camera: Frame source with start(), stop() and read_frame()
+                (ThreadedCapture or ReplaySource)
+            dispatcher (ActionDispatcher): Receives blink events (optional)
+            server (EventServer): Streams events and metrics (optional)
+            recorder (SessionRecorder): Records per-frame results (optional)
+            control_path (str): Unix socket path for control commands (optional)
+        """
+        self.eye_tracker = eye_tracker
+        self.camera = camera
+        self.dispatcher = dispatcher
+        self.server = server
+        self.recorder = recorder
+        self.control_path = control_path
+
+        # Requests from signal handlers and the control socket, handled
+        # between frames on the detection thread
+        self.stop_requested = False
+        self.reset_requested = False
+        self.stats_requested = False
+
+        self.control_socket = None
+        self.frames_processed = 0
+        self.started_at = None
+
+    def install_signal_handlers(self):
+        """Map SIGTERM/SIGINT to stop, SIGUSR1 to reset and SIGHUP to stats"""
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.request_stop())
+        signal.signal(signal.SIGINT, lambda signum, frame: self.request_stop())
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, lambda signum, frame: setattr(self, 'reset_requested', True))
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, lambda signum, frame: setattr(self, 'stats_requested', True))
+
+    def request_stop(self):
+        self.stop_requested = True
+
+    def get_stats(self):
+        """
+        Get service statistics
+
+        Returns:
+            dict: Tracker stats plus frames processed, uptime and fps
+        """
+        stats = self.eye_tracker.get_stats()
+        uptime = time.monotonic() - self.started_at if self.started_at is not None else 0.0
+        stats.update({
+            'frames_processed': self.frames_processed,
+            'uptime_s': round(uptime, 1),
+            'fps': round(self.frames_processed / uptime, 1) if uptime > 0 else None,
+            'frames_dropped': self.camera.frames_dropped
+        })
+        if self.dispatcher is not None:
+            stats['actions'] = self.dispatcher.get_stats()
+        if self.server is not None:
+            stats['server'] = self.server.get_stats()
+        return stats
+
+    def _start_control_socket(self):
+        """Listen for control commands on a Unix socket in a background thread"""
+        if os.path.exists(self.control_path):
+            os.unlink(self.control_path)
+        self.control_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.control_socket.bind(self.control_path)
+        self.control_socket.listen(4)
+        threading.Thread(target=self._control_loop, name="control-socket", daemon=True).start()
+
+    def _control_loop(self):
+        while True:
+            try:
+                conn, _ = self.control_socket.accept()
+            except OSError:
+                # Socket closed on shutdown
+                return
+            # Each client gets its own thread, so one that stays connected
+            # never blocks commands from the others
+            threading.Thread(target=self._serve_control, args=(conn,),
+                             name="control-client", daemon=True).start()
+
+    def _serve_control(self, conn):
+        """Answer one control client's commands until it disconnects"""
+        with conn, conn.makefile('rw') as stream:
+            try:
+                for line in stream:
+                    command = line.strip().lower()
+                    if command == 'stats':
+                        reply = self.get_stats()
+                    elif command == 'reset':
+                        self.reset_requested = True
+                        reply = {'ok': True}
+                    elif command == 'stop':
+                        self.request_stop()
+                        reply = {'ok': True}
+                    else:
+                        reply = {'error': f"unknown command: {command}"}
+                    stream.write(json.dumps(reply) + '\n')
+                    stream.flush()
+            except OSError:
+                # Client went away mid-reply
+                return
+
+    def _handle_requests(self):
+        """Apply reset/stats requests on the detection thread"""
+        if self.reset_requested:
+            self.reset_requested = False
+            self.eye_tracker.reset_counters()
+            print("[INFO] Blink counters reset")
+        if self.stats_requested:
+            self.stats_requested = False
+            print(f"[INFO] Stats: {json.dumps(self.get_stats())}", flush=True)
+
+    def run(self):
+        """Process frames until stopped (or the replayed recording ends)"""
+        try:
+            # Inside the try, so a camera that fails to open still stops the
+            # dispatcher, server and recorder
+            self.eye_tracker.preload()
+            self.camera.start()
+            if self.control_path:
+                self._start_control_socket()
+
+            self.started_at = time.monotonic()
+            print("[INFO] Headless blink detection running", flush=True)
+
+            while not self.stop_requested:
+                self._handle_requests()
+
+                frame = self.camera.read_frame()
+                if frame is None:
+                    if getattr(self.camera, 'finished', False):
+                        break
+                    continue
+
+                # Recorded sources keep their own timeline
+                timestamp = getattr(self.camera, 'timestamp', None)
+
+                faces, eyes, _ = self.eye_tracker.detect_faces_and_eyes(frame, draw=False)
+                blink_detected = self.eye_tracker.process_blink_detection(eyes, timestamp)
+                self.frames_processed += 1
+
+                if blink_detected:
+                    print(f"[ACTION] Blink #{self.eye_tracker.total_blinks} detected", flush=True)
+                    if self.dispatcher is not None:
+                        event = self.eye_tracker.last_blink_event
+                        self.dispatcher.dispatch({
+                            'type': 'blink',
+                            'time': time.time() if timestamp is None else timestamp,
+                            'count': self.eye_tracker.total_blinks,
+                            'duration_ms': event.duration_ms if event is not None else None
+                        })
+
+                if self.recorder is not None:
+                    self.recorder.record_tracker(self.eye_tracker, faces, eyes, blink_detected, timestamp)
+                if self.server is not None:
+                    self.server.publish_frame(self.eye_tracker, faces, eyes, blink_detected, timestamp)
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """Release the camera and stop all outputs"""
+        self.camera.stop()
+        if self.control_socket is not None:
+            self.control_socket.close()
+            self.control_socket = None
+            if os.path.exists(self.control_path):
+                os.unlink(self.control_path)
+        if self.dispatcher is not None:
+            self.dispatcher.stop()
+        if self.server is not None:
+            self.server.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+        print(f"[INFO] Stopped. Stats: {json.dumps(self.get_stats())}", flush=True)
+
+
+def parse_args():
+    """Parse command-line options"""
+    ap = argparse.ArgumentParser(description="Headless eye blink detection service")
+    ap.add_argument("--source", default="0",
+                    help="camera index, stream URL, or a recording to replay")
+    ap.add_argument("-w", "--width", type=int, default=600,
+                    help="processing frame width")
+    ap.add_argument("--backend", choices=['haar', 'landmark'], default='haar',
+                    help="eye analysis: Haar eye count or dlib landmark EAR")
+    ap.add_argument("-s", "--detection-scale", type=float, default=1.0,
+                    help="run face detection at this fraction of the frame size")
+    ap.add_argument("-t", "--track-faces", action="store_true",
+                    help="search only around previous faces between full detections")
+    ap.add_argument("--events", default=None, metavar="PATH",
+                    help="append blink events as JSON lines to this file")
+    ap.add_argument("--serve", default=None, metavar="HOST:PORT",
+                    help="stream events and metrics (e.g. 127.0.0.1:8765 or unix:/path)")
+    ap.add_argument("--record", default=None, metavar="PATH",
+                    help="append per-frame results to a binary session file")
+    ap.add_argument("--control", default=None, metavar="PATH",
+                    help="accept 'stats', 'reset' and 'stop' commands on this Unix socket")
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    eye_tracker = EyeTracker(consecutive_frames=3, backend=args.backend,
+                             detection_scale=args.detection_scale,
+                             face_tracking=args.track_faces)
+
+    # Cameras are read in a background thread; recordings frame by frame
+    if args.source.isdigit():
+        camera = ThreadedCapture(OpenCVCamera(int(args.source), width=args.width))
+    elif os.path.exists(args.source) or any(c in args.source for c in '*?['):
+        camera = ReplaySource(args.source, width=args.width)
+    else:
+        camera = ThreadedCapture(OpenCVCamera(args.source, width=args.width))
+
+    dispatcher = ActionDispatcher([FileSink(args.events)], debounce=0).start() if args.events else None
+
+    server = None
+    if args.serve:
+        if args.serve.startswith("unix:"):
+            server = EventServer(unix_path=args.serve[len("unix:"):]).start()
+        else:
+            host, _, port = args.serve.rpartition(":")
+            server = EventServer(host=host or "127.0.0.1", port=int(port)).start()
+        print(f"[INFO] Streaming events on {server.address}")
+
+    recorder = SessionRecorder(args.record) if args.record else None
+
+    service = BlinkService(eye_tracker, camera, dispatcher=dispatcher, server=server,
+                           recorder=recorder, control_path=args.control)
+    service.install_signal_handlers()
+    service.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Session Log Module
+Compact binary recording of per-frame detection results
+
+SessionRecorder appends one fixed-size record per frame (time, face box, eye
+boxes, EAR, eye state, blink events) to an append-only file. The detection
+thread only queues a small tuple; a writer thread packs queued records into a
+NumPy structured array and writes them in one call at a fixed interval.
+read_session() memory-maps the file, so long sessions can be analysed with
+NumPy without loading or parsing them.
+
+Usage:
+    python session_log.py session.blinkrec
+"""
+
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+
+
+MAGIC = b'BLINKREC'
+VERSION = 1
+HEADER_DTYPE = np.dtype([('magic', 'S8'), ('version', '<u4'), ('record_size', '<u4')])
+
+# One record per processed frame. Boxes are (x, y, w, h); unused boxes are -1.
+RECORD_DTYPE = np.dtype([
+    ('time', '<f8'),          # Frame timestamp in seconds
+    ('frame', '<u4'),         # Frame index within the session
+    ('faces', '<u2'),         # Number of faces found
+    ('eyes', '<u2'),          # Number of eyes found (all faces)
+    ('face', '<i2', (4,)),    # First face box
+    ('eye_boxes', '<i2', (2, 4)),  # First two eye boxes
+    ('ear', '<f4'),           # Eye aspect ratio (NaN when not measured)
+    ('closed', 'u1'),         # 1 while the eyes are considered closed
+    ('blink', 'u1'),          # 1 on the frame a blink was confirmed
+    ('blink_ms', '<f4'),      # Duration of that blink (NaN if unknown)
+    ('total_blinks', '<u4')   # Running blink count
+])
+
+NO_BOX = (-1, -1, -1, -1)
+
+
+class SessionRecorder:
+    def __init__(self, path, flush_interval=1.0):
+        """
+        Open a session file for appending
+
+        Args:
+            path (str): Output file (created with a header if it does not exist;
+                a trailing partial record in an existing file is removed)
+            flush_interval (float): Seconds between writes by the writer thread
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+
+        self.pending = []
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+
+        self.file = open(path, 'ab')
+        existing = 0
+        if self.file.tell() == 0:
+            header = np.array([(MAGIC, VERSION, RECORD_DTYPE.itemsize)], dtype=HEADER_DTYPE)
+            self.file.write(header.tobytes())
+        else:
+            try:
+                offset = _check_header(path)
+            except ValueError:
+                self.file.close()
+                raise
+            # Drop a partial record left by a crash mid-write, so appended
+            # records stay aligned to the record size
+            existing = (self.file.tell() - offset) // RECORD_DTYPE.itemsize
+            self.file.truncate(offset + existing * RECORD_DTYPE.itemsize)
+
+        # Statistics
+        self.records_written = 0
+
+        # Frame indices continue after the records already in the file
+        self.frame_index = existing
+
+        self.thread = threading.Thread(target=self._write_loop, name="session-writer", daemon=True)
+        self.thread.start()
+
+    def record(self, timestamp, faces, eyes, ear=None, closed=False, blink=False,
+               blink_ms=None, total_blinks=0):
+        """
+        Queue one frame record (cheap; called from the detection loop)
+
+        Args:
+            timestamp (float): Frame time in seconds
+            faces: Sequence of (x, y, w, h) face boxes
+            eyes: Sequence of (x, y, w, h) eye boxes in frame coordinates
+            ear (float): Eye aspect ratio, if the backend measures one
+            closed (bool): Eyes currently considered closed
+            blink (bool): A blink was confirmed on this frame
+            blink_ms (float): Duration of the confirmed blink
+            total_blinks (int): Running blink count
+        """
+        face = tuple(int(v) for v in faces[0]) if len(faces) else NO_BOX
+        eye_boxes = [tuple(int(v) for v in eye) for eye in eyes[:2]]
+        while len(eye_boxes) < 2:
+            eye_boxes.append(NO_BOX)
+
+        row = (timestamp, self.frame_index, len(faces), len(eyes), face, eye_boxes,
+               np.nan if ear is None else ear, closed, blink,
+               np.nan if blink_ms is None else blink_ms, total_blinks)
+        self.frame_index += 1
+
+        with self.lock:
+            self.pending.append(row)
+
+    def record_tracker(self, eye_tracker, faces, eyes, blink_detected, timestamp=None):
+        """
+        Queue a record built from an EyeTracker's state after process_blink_detection()
+
+        Args:
+            eye_tracker (EyeTracker): Tracker that processed the frame
+            faces: Face boxes returned by detect_faces_and_eyes()
+            eyes: Eye boxes returned by detect_faces_and_eyes()
+            blink_detected (bool): Result of process_blink_detection()
+            timestamp (float): Frame time in seconds (default: time.time())
+        """
+        engine = eye_tracker.blink_engine
+        closed = engine.is_closed() if engine is not None else eye_tracker.eye_closed_frames > 0
+        blink_ms = None
+        if blink_detected and eye_tracker.last_blink_event is not None:
+            blink_ms = eye_tracker.last_blink_event.duration_ms
+
+        self.record(time.time() if timestamp is None else timestamp, faces, eyes,
+                    ear=eye_tracker.last_ear, closed=closed, blink=blink_detected,
+                    blink_ms=blink_ms, total_blinks=eye_tracker.total_blinks)
+
+    def _write_loop(self):
+        """Write queued records every flush_interval until closed"""
+        while not self.stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Write all queued records to disk"""
+        with self.lock:
+            rows, self.pending = self.pending, []
+        if not rows:
+            return
+
+        self.file.write(np.array(rows, dtype=RECORD_DTYPE).tobytes())
+        self.file.flush()
+        self.records_written += len(rows)
+
+    def close(self):
+        """Stop the writer thread and write the remaining records"""
+        self.stop_event.set()
+        self.thread.join()
+        self.flush()
+        self.file.close()
+
+
+def _check_header(path):
+    """Validate a session file header; returns the header size in bytes"""
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if len(header) == 0 or header['magic'][0] != MAGIC:
+        raise ValueError(f"Not a blink session file: {path}")
+    if header['version'][0] != VERSION:
+        raise ValueError(f"Unsupported session file version {header['version'][0]} in {path} "
+                         f"(expected {VERSION})")
+    if header['record_size'][0] != RECORD_DTYPE.itemsize:
+        raise ValueError(f"Unsupported session record format in {path} "
+                         f"(version {header['version'][0]})")
+    return HEADER_DTYPE.itemsize
+
+
+def read_session(path):
+    """
+    Memory-map a session file
+
+    A trailing partial record (e.g. after a crash mid-write) is ignored.
+
+    Args:
+        path (str): Session file written by SessionRecorder
+
+    Returns:
+        numpy.memmap: Read-only structured array with RECORD_DTYPE fields
+    """
+    offset = _check_header(path)
+    count = (os.path.getsize(path) - offset) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=offset, shape=(count,))
+
+
+def summarize(records):
+    """
+    Summarize a recorded session
+
+    Args:
+        records: Structured array from read_session()
+
+    Returns:
+        dict: Frame count, duration, blink count and rate, face presence, EAR and
+            blink duration statistics
+    """
+    if len(records) == 0:
+        return {'frames': 0}
+
+    duration = float(records['time'][-1] - records['time'][0])
+    blinks = records['blink'] == 1
+    ear = records['ear'][~np.isnan(records['ear'])]
+    blink_ms = records['blink_ms'][blinks]
+    blink_ms = blink_ms[~np.isnan(blink_ms)]
+
+    return {
+        'frames': len(records),
+        'duration_s': round(duration, 2),
+        'fps': round((len(records) - 1) / duration, 1) if duration > 0 else None,
+        'blinks': int(blinks.sum()),
+        'blinks_per_min': round(blinks.sum() * 60.0 / duration, 1) if duration > 0 else None,
+        'face_present': round(float((records['faces'] > 0).mean()), 3),
+        'ear_mean': round(float(ear.mean()), 3) if len(ear) else None,
+        'blink_ms_mean': round(float(blink_ms.mean()), 1) if len(blink_ms) else None
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Summarize a recorded blink detection session")
+    ap.add_argument("session", help="session file written with main.py --record")
+    args = ap.parse_args()
+
+    records = read_session(args.session)
+    print(f"[INFO] {args.session}:")
+    for key, value in summarize(records).items():
+        print(f"  {key:<16}{value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Startup Module
+Helpers for a fast startup: background model loading and a startup-time breakdown
+"""
+
+import threading
+import time
+
+
+class StartupTimer:
+    def __init__(self):
+        """Start timing; create this as early as possible in the entry point"""
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.phases = []
+
+    def mark(self, phase):
+        """Record the time spent since the previous mark under the given phase name"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def total(self):
+        """Seconds from creation to the last mark"""
+        return self.last - self.start
+
+    def report(self):
+        """
+        Format the startup-time breakdown
+
+        Returns:
+            list: One line per phase plus the total
+        """
+        lines = [f"  {phase:<20}{duration * 1000:>8.1f} ms" for phase, duration in self.phases]
+        lines.append(f"  {'total':<20}{self.total() * 1000:>8.1f} ms")
+        return lines
+
+    def print_report(self, title="Startup time breakdown"):
+        """Print the breakdown to the console"""
+        print(f"[INFO] {title}:")
+        for line in self.report():
+            print(line)
+
+
+class BackgroundLoader:
+    def __init__(self, loader, name="loader"):
+        """
+        Run a slow loader (model deserialization, heavy import) in a background
+        thread, starting immediately
+
+        Args:
+            loader (callable): Function returning the loaded object
+            name (str): Thread name, for debugging
+        """
+        self.loader = loader
+        self.value = None
+        self.error = None
+        self.duration = None
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            self.value = self.loader()
+        except Exception as e:
+            self.error = e
+        self.duration = time.perf_counter() - start
+
+    def ready(self):
+        """True once loading has finished (successfully or not)"""
+        return not self.thread.is_alive()
+
+    def result(self, timeout=None):
+        """
+        Wait for the loader and return its result
+
+        Args:
+            timeout (float): Seconds to wait (None = forever)
+
+        Returns:
+            The loaded object; re-raises any exception from the loader
+        """
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            raise TimeoutError("Background loading did not finish in time")
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def wait_for_frame(stream, timeout=2.0, poll_interval=0.01):
+    """
+    Wait until a video stream delivers its first frame, instead of a fixed warm-up sleep
+
+    Args:
+        stream: Object with a read() method returning a frame or None
+        timeout (float): Maximum seconds to wait
+        poll_interval (float): Seconds between polls
+
+    Returns:
+        First frame, or None if none arrived within the timeout
+    """
+    deadline = time.perf_counter() + timeout
+    while True:
+        frame = stream.read()
+        if frame is not None or time.perf_counter() >= deadline:
+            return frame
+        time.sleep(poll_interval)